@@ -0,0 +1,260 @@
+"""Batch episode runner for difficulty tuning.
+
+Fans seeded headless episodes out over a process pool, each flown by a pilot
+policy, and aggregates survival time, score, level reached and cause of death.
+
+    python batch_runner.py --episodes 2000 --policy scripted
+    python batch_runner.py --set 3.obstacle_speed=450 --set initial_ammo=30
+    python batch_runner.py --sweep 2.penalty_ratio=0.1,0.3,0.5 --jsonl results.jsonl
+
+Level settings are LEVEL.key (e.g. 3.obstacle_health); initial_ammo and
+ammo_recharge_time set the ammo rules.
+"""
+import argparse
+import contextlib
+import copy
+import json
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+from simulation import World, LEVEL_CONFIG, INITIAL_AMMO, AMMO_RECHARGE_TIME, FIXED_DT, WORLD_H
+
+MAX_EPISODE_TIME = 300.0  # Simulated seconds before an episode counts as survived
+
+# =========================
+# PILOT POLICIES
+# =========================
+# A pilot is World.input_source: called before every tick, it applies the
+# actions it wants through world.apply_action. Pilots are built per episode
+# from the episode seed and tick length so every episode is reproducible.
+
+class RandomPilot:
+    """Mashes buttons: random moves and shots at fixed rates per second"""
+    MOVE_RATE = 6.0
+    SHOOT_RATE = 1.5
+
+    def __init__(self, seed, dt):
+        self.rng = random.Random(str(seed) + ":pilot")
+        self.dt = dt
+
+    def __call__(self, world):
+        if self.rng.random() < self.MOVE_RATE * self.dt:
+            world.apply_action(self.rng.choice(["up", "down", "left", "right"]))
+        if self.rng.random() < self.SHOOT_RATE * self.dt:
+            world.apply_action("shoot")
+
+class ScriptedPilot:
+    """Dodges whatever is about to hit the ship and shoots normal obstacles in its line"""
+    LOOKAHEAD = 1.0  # Seconds of obstacle travel to react to
+    MARGIN = 45.0  # Ship radius plus slack
+    SHOT_INTERVAL = 0.25
+    # Where each move stops (World.move_ship clamps there) and the way back
+    LIMITS = {"up": ("y", WORLD_H/2 - 50), "down": ("y", -WORLD_H/2 + 50),
+              "left": ("z", -170), "right": ("z", 170)}
+    OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+    def __init__(self, seed, dt):
+        self.next_shot = 0.0
+
+    def __call__(self, world):
+        spaceship = world.spaceship
+        obstacles = world.obstacles
+        if len(obstacles) == 0:
+            return
+        x, y, z = obstacles.positions()
+        size = obstacles.column("size")
+        penalty = obstacles.column("flag").astype(bool)
+        speed = -obstacles.column("vx")
+
+        ahead = (x > spaceship["x"] - size) & (x - spaceship["x"] < speed * self.LOOKAHEAD + self.MARGIN)
+        dy = y - spaceship["y"]
+        dz = z - spaceship["z"]
+        reach = size + self.MARGIN
+
+        # Dodge the nearest obstacle whose lane overlaps the ship
+        threat = np.flatnonzero(ahead & (np.abs(dy) < reach) & (np.abs(dz) < reach))
+        if len(threat):
+            i = threat[np.argmin(x[threat])]
+            # Clear along whichever axis the obstacle is already further off
+            if abs(dy[i]) >= abs(dz[i]):
+                action = "down" if dy[i] > 0 else "up"
+            else:
+                action = "left" if dz[i] > 0 else "right"
+            axis, limit = self.LIMITS[action]
+            if spaceship[axis] == limit:
+                action = self.OPPOSITE[action]
+            world.apply_action(action)
+
+        # Shoot the nearest normal obstacle straight ahead (never a penalty one)
+        in_line = ahead & (np.abs(dy) < size) & (np.abs(dz) < size)
+        line = np.flatnonzero(in_line)
+        sim_time = world.game_state["sim_time"]
+        if len(line) and sim_time >= self.next_shot and world.game_state["ammo"] > 0:
+            if not penalty[line[np.argmin(x[line])]]:
+                world.apply_action("shoot")
+                self.next_shot = sim_time + self.SHOT_INTERVAL
+
+POLICIES = {
+    "random": RandomPilot,
+    "scripted": ScriptedPilot
+}
+
+# =========================
+# EPISODES
+# =========================
+
+def run_episode(task):
+    """Play one episode headless; returns its result dict.
+    `task` is (seed, policy name, settings, max_time, dt) as built by make_tasks."""
+    seed, policy, settings, max_time, dt = task
+    world = World(seed, level_config=settings["level_config"], star_count=0,
+                  initial_ammo=settings["initial_ammo"],
+                  ammo_recharge_time=settings["ammo_recharge_time"])
+    world.input_source = POLICIES[policy](seed, dt)
+    game_state = world.game_state
+
+    world.apply_action("click")
+    while not game_state["game_over"] and game_state["sim_time"] < max_time:
+        world.step(dt=dt)
+
+    return {
+        "seed": seed,
+        "survival_time": round(game_state["sim_time"], 4),
+        "score": game_state["score"],
+        "level": game_state["level"],
+        "cause": game_state["cause_of_death"] or "survived",
+        "ticks": game_state["tick"]
+    }
+
+def make_settings(overrides):
+    """Game settings (level config + ammo rules) with KEY=value overrides applied"""
+    settings = {
+        "level_config": copy.deepcopy(LEVEL_CONFIG),
+        "initial_ammo": INITIAL_AMMO,
+        "ammo_recharge_time": AMMO_RECHARGE_TIME
+    }
+    for key, value in overrides:
+        if key in ("initial_ammo", "ammo_recharge_time"):
+            settings[key] = type(settings[key])(value)
+            continue
+        level, _, name = key.partition(".")
+        config = settings["level_config"].get(int(level)) if level.isdigit() else None
+        if config is None or name not in config:
+            raise ValueError("unknown setting " + key)
+        current = config[name]
+        config[name] = value.lower() in ("1", "true", "yes") if isinstance(current, bool) else type(current)(value)
+    return settings
+
+def make_tasks(settings, episodes, policy, first_seed=0, max_time=MAX_EPISODE_TIME, dt=FIXED_DT):
+    """One run_episode task per seed in [first_seed, first_seed + episodes)"""
+    return [(first_seed + i, policy, settings, max_time, dt) for i in range(episodes)]
+
+def run_batch(tasks, workers=None, on_result=None):
+    """Run every task across a process pool; results stream to on_result as
+    episodes finish. Returns the results in seed order."""
+    results = []
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 8))
+    if workers == 1:
+        stream = map(run_episode, tasks)
+        pool = contextlib.nullcontext()
+    else:
+        pool = multiprocessing.Pool(workers)
+        stream = pool.imap_unordered(run_episode, tasks, chunksize)
+    with pool:
+        for result in stream:
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    results.sort(key=lambda result: result["seed"])
+    return results
+
+# =========================
+# AGGREGATION
+# =========================
+
+def aggregate(results):
+    """Summary statistics over a list of episode results"""
+    survival = np.array([result["survival_time"] for result in results])
+    score = np.array([result["score"] for result in results])
+    causes = {}
+    levels = {}
+    for result in results:
+        causes[result["cause"]] = causes.get(result["cause"], 0) + 1
+        levels[result["level"]] = levels.get(result["level"], 0) + 1
+    return {
+        "episodes": len(results),
+        "survival_mean": round(float(survival.mean()), 2),
+        "survival_p10": round(float(np.percentile(survival, 10)), 2),
+        "survival_median": round(float(np.median(survival)), 2),
+        "survival_p90": round(float(np.percentile(survival, 90)), 2),
+        "score_mean": round(float(score.mean()), 2),
+        "score_median": float(np.median(score)),
+        "levels": dict(sorted(levels.items())),
+        "causes": dict(sorted(causes.items()))
+    }
+
+def report(label, summary):
+    print(label)
+    print("  episodes " + str(summary["episodes"]) +
+          "   survival mean " + str(summary["survival_mean"]) + "s" +
+          " (p10 " + str(summary["survival_p10"]) + ", median " + str(summary["survival_median"]) +
+          ", p90 " + str(summary["survival_p90"]) + ")" +
+          "   score mean " + str(summary["score_mean"]) + " (median " + str(summary["score_median"]) + ")")
+    print("  levels reached " + str(summary["levels"]) + "   causes " + str(summary["causes"]))
+
+# =========================
+# MAIN
+# =========================
+
+def parse_assignment(text):
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("expected KEY=VALUE, got " + text)
+    return key, value
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded headless episodes in parallel and aggregate them")
+    parser.add_argument("--episodes", type=int, default=1000, help="episodes per configuration")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="scripted")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="first episode seed")
+    parser.add_argument("--max-time", type=float, default=MAX_EPISODE_TIME, help="simulated seconds per episode")
+    parser.add_argument("--dt", type=float, default=FIXED_DT, help="simulation tick length")
+    parser.add_argument("--set", type=parse_assignment, action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--sweep", type=parse_assignment, default=None, metavar="KEY=V1,V2,...")
+    parser.add_argument("--jsonl", default=None, help="also write one line per episode here")
+    args = parser.parse_args()
+
+    configurations = [("base", args.set)]
+    if args.sweep is not None:
+        key, values = args.sweep
+        configurations = [(key + "=" + value, args.set + [(key, value)]) for value in values.split(",")]
+
+    out = open(args.jsonl, "w") if args.jsonl else None
+    start = time.perf_counter()
+    total_ticks = 0
+    for label, overrides in configurations:
+        settings = make_settings(overrides)
+        tasks = make_tasks(settings, args.episodes, args.policy, args.seed, args.max_time, args.dt)
+
+        def on_result(result, label=label):
+            if out is not None:
+                out.write(json.dumps(dict(result, config=label)) + "\n")
+
+        results = run_batch(tasks, args.workers, on_result)
+        total_ticks += sum(result["ticks"] for result in results)
+        report(label, aggregate(results))
+    if out is not None:
+        out.close()
+
+    elapsed = time.perf_counter() - start
+    print("\n" + str(total_ticks) + " ticks in " + str(round(elapsed, 2)) + "s (" +
+          str(round(total_ticks / max(elapsed, 1e-9))) + " ticks/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Simulation benchmark: per-tick cost of update_game/check_collisions at scale,
+and of World.place_background (the per-frame background cost a renderer pays;
+the "stars" scenarios scale it).
+
+    python benchmark.py            # run the sweep, compare with the saved baseline
+                                   # (the first run on a machine saves it)
+    python benchmark.py --save     # run the sweep and store it as the new baseline
+    python benchmark.py --quick    # smaller sweep (fewer ticks, smallest sizes)
+
+Scenes are built by the real World.initialize_scene/spawn_obstacles code with
+LEVEL_CONFIG entries scaled up, so a slower hot path shows up here first.
+"""
+import copy
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from simulation import World, LEVEL_CONFIG, Projectile, WORLD_W, WORLD_H, FIXED_DT
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+SLOWDOWN_THRESHOLD = 1.25  # Flag scenarios whose median got 25% slower than baseline
+WARMUP_TICKS = 20
+TICKS = 500
+
+# (name, level, stars, obstacles, projectiles, explosions per tick)
+SCENARIOS = [
+    ("default level 1", 1, 600, 15, 0, 0),
+    ("default level 3", 3, 600, 25, 0, 0),
+    ("stars 6k", 1, 6000, 15, 0, 0),
+    ("stars 60k", 1, 60000, 15, 0, 0),
+    ("stars 100k", 1, 100000, 15, 0, 0),
+    ("obstacles 100", 3, 600, 100, 0, 0),
+    ("obstacles 1k", 3, 600, 1000, 0, 0),
+    ("obstacles 10k", 3, 600, 10000, 0, 0),
+    ("projectiles 100", 3, 600, 1000, 100, 0),
+    ("projectiles 1k", 3, 600, 1000, 1000, 0),
+    ("projectiles 5k", 3, 600, 10000, 5000, 0),
+    ("particles 10 bursts/tick", 3, 600, 25, 0, 10),
+    ("particles 100 bursts/tick", 3, 600, 25, 0, 100),
+]
+QUICK_SCENARIOS = ["default level 1", "default level 3", "stars 6k", "obstacles 1k", "projectiles 1k",
+                   "particles 10 bursts/tick"]
+
+# =========================
+# SCENES
+# =========================
+
+def build_world(level, stars, obstacles, explosions, seed=1234):
+    """World at `level` with `obstacles` spawned by the level's own spawn logic"""
+    level_config = copy.deepcopy(LEVEL_CONFIG)
+    level_config[level]["obstacle_count"] = obstacles
+    # Room for every particle alive at once (life <= 0.8 s)
+    particle_cap = max(2048, explosions * 15 * int(0.8 / FIXED_DT + 1))
+
+    world = World(seed, level_config=level_config, star_count=stars, particle_cap=particle_cap)
+    world.apply_action("click")
+    world.game_state["level"] = level
+    world.spawn_obstacles()
+    # Nothing ends the run early: the ship can't run out of lives
+    world.game_state["lives"] = 10**9
+    return world
+
+def top_up(world, projectiles, explosions, rng):
+    """Keep the projectile/particle load constant between ticks (untimed)"""
+    missing = projectiles - len(world.projectiles)
+    for _ in range(max(0, missing)):
+        Projectile.spawn(world.projectiles, rng.uniform(-WORLD_W/2, WORLD_W/2),
+                         rng.uniform(-WORLD_H/2, WORLD_H/2), rng.uniform(-170, 170))
+    for _ in range(explosions):
+        world.create_explosion(rng.uniform(-WORLD_W/2, WORLD_W/2), rng.uniform(-WORLD_H/2, WORLD_H/2),
+                               rng.uniform(-170, 170), [1.0, 0.5, 0.0])
+
+# =========================
+# MEASUREMENT
+# =========================
+
+def summarize(samples):
+    """Median/p99 (ms) of per-tick samples in seconds"""
+    samples = np.asarray(samples) * 1000.0
+    return {"median_ms": round(float(np.median(samples)), 4),
+            "p99_ms": round(float(np.percentile(samples, 99)), 4)}
+
+def run_scenario(level, stars, obstacles, projectiles, explosions, ticks):
+    """Time update_game (and the check_collisions inside it) and place_background
+    for `ticks` ticks"""
+    world = build_world(level, stars, obstacles, explosions)
+    rng = np.random.default_rng(99)
+    collision_samples = []
+
+    check_collisions = world.check_collisions
+    def timed_check_collisions(*args):
+        start = time.perf_counter()
+        check_collisions(*args)
+        collision_samples.append(time.perf_counter() - start)
+    world.check_collisions = timed_check_collisions
+
+    update_samples = []
+    background_samples = []
+    for tick in range(WARMUP_TICKS + ticks):
+        top_up(world, projectiles, explosions, rng)
+        start = time.perf_counter()
+        world.update_game(FIXED_DT)
+        placed = time.perf_counter()
+        world.place_background()
+        end = time.perf_counter()
+        if tick >= WARMUP_TICKS:
+            update_samples.append(placed - start)
+            background_samples.append(end - placed)
+    del collision_samples[:WARMUP_TICKS]
+
+    update = summarize(update_samples)
+    update["ticks_per_second"] = round(1.0 / max(float(np.mean(update_samples)), 1e-12))
+    return {"update_game": update, "check_collisions": summarize(collision_samples),
+            "place_background": summarize(background_samples)}
+
+def run(names, ticks):
+    """Run the chosen scenarios; returns {name: result}"""
+    results = {}
+    for name, level, stars, obstacles, projectiles, explosions in SCENARIOS:
+        if name not in names:
+            continue
+        result = run_scenario(level, stars, obstacles, projectiles, explosions, ticks)
+        result["scene"] = {"level": level, "stars": stars, "obstacles": obstacles,
+                           "projectiles": projectiles, "explosions_per_tick": explosions}
+        results[name] = result
+        print(report_line(name, result))
+    return results
+
+# =========================
+# REPORTING
+# =========================
+
+def report_line(name, result, baseline=None):
+    update = result["update_game"]
+    line = (name.ljust(28) +
+            ("%9.3f" % update["median_ms"]) + ("%9.3f" % update["p99_ms"]) +
+            ("%9.3f" % result["check_collisions"]["median_ms"]) +
+            ("%10d" % update["ticks_per_second"]) +
+            ("%12.3f" % result["place_background"]["median_ms"]))
+    if baseline is not None:
+        ratio = update["median_ms"] / max(baseline["update_game"]["median_ms"], 1e-9)
+        line += "   x%.2f" % ratio
+        if "place_background" in baseline:
+            background_ratio = (result["place_background"]["median_ms"] /
+                                max(baseline["place_background"]["median_ms"], 1e-9))
+            line += " (background x%.2f)" % background_ratio
+            ratio = max(ratio, background_ratio)
+        if ratio > SLOWDOWN_THRESHOLD:
+            line += "  SLOWER"
+    return line
+
+def main():
+    args = sys.argv[1:]
+    quick = "--quick" in args
+    names = QUICK_SCENARIOS if quick else [scenario[0] for scenario in SCENARIOS]
+    ticks = TICKS // 4 if quick else TICKS
+
+    print("scenario".ljust(28) + "   median      p99  collide  ticks/s  background"
+          "   (ms per tick; background: place_background)")
+    results = run(names, ticks)
+
+    # Timings only compare on the machine that made them, so the first run
+    # there becomes the baseline
+    if "--save" in args or not os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "ticks": ticks, "scenarios": results}, f, indent=2)
+        print("\nBaseline saved to " + BASELINE_PATH + "; later runs are compared with it")
+        return
+
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)["scenarios"]
+    print("\nCompared with " + BASELINE_PATH + ":")
+    slower = 0
+    for name, result in results.items():
+        if name in baseline:
+            line = report_line(name, result, baseline[name])
+            slower += line.endswith("SLOWER")
+            print(line)
+    if slower:
+        print("\n" + str(slower) + " scenario(s) slower than baseline")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
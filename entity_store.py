@@ -0,0 +1,379 @@
+"""Structure-of-arrays entity storage with vectorized update kernels"""
+import numpy as np
+
+# Columns every store has
+BASE_COLUMNS = (
+    "x", "y", "z", "vx", "vy", "vz",
+    "rotation", "spin", "phase", "phase_rate",
+    "life", "size", "health", "max_health",
+    "r", "g", "b"
+)
+
+class Column:
+    """Attribute on an entity view that reads/writes one row of a store column"""
+    def __init__(self, name, cast=float):
+        self.name = name
+        self.cast = cast
+
+    def __get__(self, view, owner):
+        if view is None:
+            return self
+        return self.cast(view.store.arrays[self.name][view.index])
+
+    def __set__(self, view, value):
+        view.store.arrays[self.name][view.index] = value
+
+class ColorColumn:
+    """[r, g, b] attribute backed by the r/g/b columns"""
+    def __get__(self, view, owner):
+        if view is None:
+            return self
+        arrays, i = view.store.arrays, view.index
+        return [float(arrays["r"][i]), float(arrays["g"][i]), float(arrays["b"][i])]
+
+    def __set__(self, view, value):
+        arrays, i = view.store.arrays, view.index
+        arrays["r"][i], arrays["g"][i], arrays["b"][i] = value[0], value[1], value[2]
+
+class NameColumn:
+    """String attribute stored as an index into the view class' `names` list"""
+    def __init__(self, column, names):
+        self.column = column
+        self.names = names
+
+    def __get__(self, view, owner):
+        if view is None:
+            return self
+        return self.names[view.store.arrays[self.column][view.index]]
+
+    def __set__(self, view, value):
+        view.store.arrays[self.column][view.index] = self.names.index(value)
+
+class EntityView:
+    """Thin per-entity handle onto one row of an EntityStore.
+    Creating a view appends a zeroed row to the store."""
+    EXTRA_COLUMNS = ()
+    # (value, rate) column pairs advanced by integrate(): value += rate * dt
+    INTEGRATED = (("x", "vx"), ("y", "vy"), ("z", "vz"), ("rotation", "spin"), ("phase", "phase_rate"))
+    AGES = True  # Whether integrate() counts `life` down
+
+    x = Column("x")
+    y = Column("y")
+    z = Column("z")
+    vx = Column("vx")
+    vy = Column("vy")
+    vz = Column("vz")
+    life = Column("life")
+    size = Column("size")
+    rotation = Column("rotation")
+    rotation_speed = Column("spin")
+    color = ColorColumn()
+
+    def __init__(self, store):
+        self.store = store
+        self.index = store.add(self)
+
+    @classmethod
+    def spawn(cls, store, *args):
+        """New entity in `store`: a pooled view re-initialized in place by
+        reset(*args) when the store has one, else cls(store, *args)"""
+        if not store.free:
+            return cls(store, *args)
+        view = store.free.pop()
+        view.index = store.add(view)
+        view.reset(*args)
+        return view
+
+class EntityStore:
+    """Contiguous float32 columns (plus int8 kind/flag columns) for one entity type.
+    Removed views are retired, then pooled by recycle() for EntityView.spawn to
+    reuse; a view removed this tick is never handed out again before recycle(),
+    so `view in store` stays reliable for references held during the tick."""
+    def __init__(self, view_class, capacity=64):
+        self.view_class = view_class
+        self.capacity = capacity
+        self.count = 0
+        self.views = []
+        self.next_uid = 0  # Every row added gets a new view.uid (stable, unlike index)
+        self.retired = []  # Views removed since the last recycle()
+        self.free = []  # Views ready for EntityView.spawn to re-initialize
+        self.arrays = {}
+        for name in BASE_COLUMNS + tuple(view_class.EXTRA_COLUMNS):
+            self.arrays[name] = np.zeros(capacity, np.float32)
+        self.arrays["kind"] = np.zeros(capacity, np.int8)
+        self.arrays["flag"] = np.zeros(capacity, np.int8)
+
+    # -------------------------
+    # List-like access (for drawing and collision code)
+    # -------------------------
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, item):
+        return self.views[item]
+
+    def __contains__(self, view):
+        return view.store is self and view.index >= 0 and self.views[view.index] is view
+
+    def column(self, name):
+        """Live slice of a column covering the current entities"""
+        return self.arrays[name][:self.count]
+
+    def positions(self):
+        """(x, y, z) live column slices"""
+        return self.column("x"), self.column("y"), self.column("z")
+
+    def velocities(self):
+        """(vx, vy, vz) live column slices"""
+        return self.column("vx"), self.column("vy"), self.column("vz")
+
+    # -------------------------
+    # Row management
+    # -------------------------
+
+    def add(self, view):
+        """Reserve a zeroed row for `view` and return its index"""
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        index = self.count
+        for array in self.arrays.values():
+            array[index] = 0
+        view.uid = self.next_uid
+        self.next_uid += 1
+        self.views.append(view)
+        self.count += 1
+        return index
+
+    def extend(self, count):
+        """Append `count` zeroed rows in one pass, each with a pooled view or
+        else a bare one (its class' __init__ is not run); returns the slice
+        of the new rows"""
+        start = self.count
+        if start + count > self.capacity:
+            self.grow(max(self.capacity * 2, start + count))
+        for array in self.arrays.values():
+            array[start:start + count] = 0
+        view_class = self.view_class
+        free = self.free
+        for index in range(start, start + count):
+            view = free.pop() if free else view_class.__new__(view_class)
+            view.store = self
+            view.index = index
+            view.uid = self.next_uid + index - start
+            self.views.append(view)
+        self.next_uid += count
+        self.count += count
+        return slice(start, start + count)
+
+    def grow(self, capacity):
+        """Reallocate every column with room for `capacity` rows"""
+        for name, array in self.arrays.items():
+            bigger = np.zeros(capacity, array.dtype)
+            bigger[:self.count] = array[:self.count]
+            self.arrays[name] = bigger
+        self.capacity = capacity
+
+    def remove(self, view):
+        """Swap-remove one entity in O(1); the last row takes its place"""
+        index = view.index
+        last = self.count - 1
+        if index != last:
+            for array in self.arrays.values():
+                array[index] = array[last]
+            moved = self.views[last]
+            moved.index = index
+            self.views[index] = moved
+        self.views.pop()
+        self.count -= 1
+        view.index = -1
+        self.retired.append(view)
+
+    def remove_where(self, mask):
+        """Remove every entity whose entry in the boolean `mask` is set.
+        Rows end up exactly where removing them one by one (highest index
+        first) would leave them, with one fancy-indexed copy per column."""
+        removed = np.flatnonzero(mask)
+        if len(removed) == 0:
+            return
+        # Replay the swaps on row numbers only: filled[row] = source row
+        filled = {}
+        last = self.count - 1
+        for index in removed[::-1].tolist():
+            if index != last:
+                filled[index] = filled.pop(last, last)
+            else:
+                filled.pop(last, None)
+            last -= 1
+        views = self.views
+        for index in removed.tolist():
+            views[index].index = -1
+            self.retired.append(views[index])
+        if filled:
+            rows = np.fromiter(filled.keys(), np.intp, len(filled))
+            sources = np.fromiter(filled.values(), np.intp, len(filled))
+            for array in self.arrays.values():
+                array[rows] = array[sources]
+            for row, source in filled.items():
+                moved = views[source]
+                moved.index = row
+                views[row] = moved
+        del views[last + 1:]
+        self.count = last + 1
+
+    def clear(self):
+        """Drop all entities"""
+        for view in self.views:
+            view.index = -1
+        self.retired.extend(self.views)
+        self.views = []
+        self.count = 0
+
+    def recycle(self):
+        """Pool the views retired since the last call (once per tick); the
+        pool never keeps more views than the store has rows"""
+        self.free.extend(self.retired)
+        self.retired.clear()
+        del self.free[self.capacity:]
+
+    def freeze(self):
+        """Read-only copy of the live rows, safe to hand to another thread"""
+        return FrozenStore(self)
+
+    def copy(self):
+        """Independent store with the same rows (and views of its own)"""
+        clone = EntityStore(self.view_class, self.capacity)
+        rows = clone.extend(self.count)
+        for name, array in self.arrays.items():
+            clone.arrays[name][rows] = array[rows]
+        return clone
+
+    # -------------------------
+    # Kernels
+    # -------------------------
+
+    def integrate(self, dt):
+        """Advance positions, rotations and phases by their rates and age every entity"""
+        n = self.count
+        if n == 0:
+            return
+        arrays = self.arrays
+        for value, rate in self.view_class.INTEGRATED:
+            arrays[value][:n] += arrays[rate][:n] * dt
+        if self.view_class.AGES:
+            arrays["life"][:n] -= dt
+
+class FrozenStore:
+    """Immutable copy of an EntityStore's live rows: column(), positions(),
+    len(), iteration and indexing like the store, with views that read the
+    copy (and fail on writes)"""
+    def __init__(self, store):
+        count = store.count
+        self.view_class = store.view_class
+        self.count = count
+        self.arrays = {}
+        for name, array in store.arrays.items():
+            copy = array[:count].copy()
+            copy.flags.writeable = False
+            self.arrays[name] = copy
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        view = self.view_class.__new__(self.view_class)
+        view.store = self
+        view.index = index
+        return view
+
+    def __iter__(self):
+        return (self[index] for index in range(self.count))
+
+    def column(self, name):
+        return self.arrays[name]
+
+    def positions(self):
+        return self.arrays["x"], self.arrays["y"], self.arrays["z"]
+
+    def velocities(self):
+        return self.arrays["vx"], self.arrays["vy"], self.arrays["vz"]
+
+class ParticlePool:
+    """Fixed-capacity ring buffer of particles.
+    Emitting writes into the next slots (overwriting the oldest particles once
+    the buffer is full), so explosions never allocate. Dead slots have
+    life <= 0 and a colour alpha of 0, so the whole buffer can be drawn as-is."""
+    def __init__(self, capacity=2048, rng=None):
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 3), np.float32)
+        self.velocity = np.zeros((capacity, 3), np.float32)
+        self.color = np.zeros((capacity, 4), np.float32)  # rgba, alpha follows life
+        self.life = np.zeros(capacity, np.float32)
+        self.size = np.zeros(capacity, np.float32)
+        self.head = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._step = np.zeros((capacity, 3), np.float32)
+
+    def freeze(self):
+        """Read-only copy of what drawing needs (see FrozenParticles)"""
+        return FrozenParticles(self)
+
+    def __len__(self):
+        """Number of live particles"""
+        return int(np.count_nonzero(self.life > 0))
+
+    def emit(self, x, y, z, color, count):
+        """Burst of `count` particles at (x, y, z)"""
+        count = min(count, self.capacity)
+        start = self.head
+        end = start + count
+        if end <= self.capacity:
+            self._emit_slots(start, end, x, y, z, color)
+        else:
+            self._emit_slots(start, self.capacity, x, y, z, color)
+            self._emit_slots(0, end - self.capacity, x, y, z, color)
+        self.head = end % self.capacity
+
+    def _emit_slots(self, start, end, x, y, z, color):
+        """Initialise the contiguous slot range [start, end)"""
+        rng = self.rng
+        self.position[start:end] = (x, y, z)
+        velocity = self.velocity[start:end]
+        rng.random(dtype=np.float32, out=velocity)
+        velocity *= 200
+        velocity -= 100  # uniform(-100, 100) per axis
+        life = self.life[start:end]
+        rng.random(dtype=np.float32, out=life)
+        life *= 0.5
+        life += 0.3  # uniform(0.3, 0.8)
+        size = self.size[start:end]
+        rng.random(dtype=np.float32, out=size)
+        size *= 3
+        size += 2  # uniform(2, 5)
+        self.color[start:end, :3] = color[:3]
+        self.color[start:end, 3] = life
+
+    def update(self, dt):
+        """Move every particle and fade it out as its life runs down"""
+        np.multiply(self.velocity, dt, out=self._step)
+        self.position += self._step
+        self.life -= dt
+        np.clip(self.life, 0.0, None, out=self.color[:, 3])
+
+    def clear(self):
+        """Kill every particle"""
+        self.life[:] = 0
+        self.color[:, 3] = 0
+
+class FrozenParticles:
+    """Immutable copy of a ParticlePool's positions, velocities and colours"""
+    def __init__(self, pool):
+        self.capacity = pool.capacity
+        self.position = pool.position.copy()
+        self.velocity = pool.velocity.copy()
+        self.color = pool.color.copy()
+        for array in (self.position, self.velocity, self.color):
+            array.flags.writeable = False
@@ -0,0 +1,129 @@
+"""Structured game event log: an in-memory ring buffer of event dicts,
+optionally streamed to a JSONL file by a background writer thread.
+
+    world.events.emit("level_up", tick, "LEVEL 2 REACHED!", level=2)
+
+emit() only appends to the ring buffer (and queues `text` for the console
+echo thread when echo is on), so the game loop never waits on a file or a
+terminal.
+"""
+import json
+import threading
+from collections import deque
+
+EVENT_CAPACITY = 8192  # Events kept in memory (and the most a writer can fall behind)
+FLUSH_INTERVAL = 0.25  # Seconds between background writes
+
+class EventLog:
+    """Ring buffer of the latest events, each {"seq", "tick", "type", ...fields}"""
+    def __init__(self, capacity=EVENT_CAPACITY, echo=False):
+        self.events = deque(maxlen=capacity)
+        self.emitted = 0  # Events ever emitted (the next event's seq)
+        self.echo = echo  # Print each event's text to the console as well
+        self.lock = threading.Lock()
+        self.writer = None
+        self.console = None  # ConsoleEcho, started by the first echoed event
+
+    def emit(self, kind, tick, text=None, **fields):
+        """Record one event; `text` is its console line when echo is on"""
+        fields["seq"] = self.emitted
+        fields["tick"] = tick
+        fields["type"] = kind
+        with self.lock:
+            self.events.append(fields)
+            self.emitted += 1
+        if self.echo and text is not None:
+            if self.console is None:
+                self.console = ConsoleEcho(self.events.maxlen, FLUSH_INTERVAL)
+                self.console.start()
+            self.console.lines.append(text)
+
+    def since(self, seq):
+        """Events with seq >= `seq` still in the buffer, and how many older
+        ones in that range have already been overwritten"""
+        with self.lock:
+            pending = self.emitted - seq
+            kept = min(pending, len(self.events))
+            events = [self.events[i] for i in range(len(self.events) - kept, len(self.events))]
+        return events, pending - kept
+
+    def recent(self, count):
+        """The last `count` events"""
+        return self.since(max(0, self.emitted - count))[0]
+
+    # -------------------------
+    # JSONL output
+    # -------------------------
+
+    def open(self, path, interval=FLUSH_INTERVAL):
+        """Start streaming every event from now on to `path` as JSON lines"""
+        self.close()
+        self.writer = JsonlWriter(self, path, interval)
+        self.writer.start()
+
+    def close(self):
+        """Write out whatever is pending and stop the writer and console echo"""
+        if self.writer is not None:
+            self.writer.stop()
+            self.writer = None
+        if self.console is not None:
+            self.console.stop()
+            self.console = None
+
+class JsonlWriter(threading.Thread):
+    """Daemon thread that appends a log's new events to a file every `interval`
+    seconds. If it falls more than the buffer's capacity behind, the lost
+    events are recorded as one {"type": "dropped", "count": n} line."""
+    def __init__(self, log, path, interval):
+        threading.Thread.__init__(self, name="event writer", daemon=True)
+        self.log = log
+        self.file = open(path, "w")
+        self.interval = interval
+        self.next_seq = log.emitted
+        self.stopping = threading.Event()
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            self.flush()
+        self.flush()
+        self.file.close()
+
+    def flush(self):
+        events, dropped = self.log.since(self.next_seq)
+        if dropped:
+            self.file.write(json.dumps({"type": "dropped", "count": dropped}) + "\n")
+        if events:
+            self.file.write("".join(json.dumps(event) + "\n" for event in events))
+        self.next_seq += dropped + len(events)
+        self.file.flush()
+
+    def stop(self):
+        self.stopping.set()
+        self.join()
+
+class ConsoleEcho(threading.Thread):
+    """Daemon thread that prints queued event lines every `interval` seconds,
+    so a slow terminal never stalls the thread that emitted them. Beyond
+    `capacity` unprinted lines the oldest are dropped."""
+    def __init__(self, capacity, interval):
+        threading.Thread.__init__(self, name="event echo", daemon=True)
+        self.lines = deque(maxlen=capacity)  # append/popleft are atomic: no lock
+        self.interval = interval
+        self.stopping = threading.Event()
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        lines = self.lines
+        batch = []
+        while lines:
+            batch.append(lines.popleft())
+        if batch:
+            print("\n".join(batch), flush=True)
+
+    def stop(self):
+        self.stopping.set()
+        self.join()
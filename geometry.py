@@ -0,0 +1,132 @@
+"""Camera math for view-frustum culling and level of detail, and NumPy meshes
+of the GLUT solids (no OpenGL imports).
+
+perspective() and look_at() build the same matrices as gluPerspective and
+gluLookAt, so a Camera made from set_camera()'s arguments sees exactly what
+the renderer draws.
+"""
+import math
+
+import numpy as np
+
+def perspective(fovy, aspect, near, far):
+    """4x4 projection matrix of gluPerspective (column-vector convention)"""
+    f = 1.0 / math.tan(math.radians(fovy) / 2)
+    m = np.zeros((4, 4))
+    m[0, 0] = f / aspect
+    m[1, 1] = f
+    m[2, 2] = (far + near) / (near - far)
+    m[2, 3] = 2 * far * near / (near - far)
+    m[3, 2] = -1.0
+    return m
+
+def look_at(eye, center, up):
+    """4x4 view matrix of gluLookAt"""
+    eye = np.asarray(eye, float)
+    forward = np.asarray(center, float) - eye
+    forward /= np.linalg.norm(forward)
+    side = np.cross(forward, up)
+    side /= np.linalg.norm(side)
+    m = np.identity(4)
+    m[0, :3] = side
+    m[1, :3] = np.cross(side, forward)
+    m[2, :3] = -forward
+    m[:3, 3] = -m[:3, :3] @ eye
+    return m
+
+def frustum_planes(view_projection):
+    """(6, 4) inward-facing planes (a, b, c, d), normalized so that
+    a*x + b*y + c*z + d is the signed distance of a world point"""
+    m = view_projection
+    planes = np.array([m[3] + m[0], m[3] - m[0],  # left, right
+                       m[3] + m[1], m[3] - m[1],  # bottom, top
+                       m[3] + m[2], m[3] - m[2]])  # near, far
+    return planes / np.linalg.norm(planes[:, :3], axis=1)[:, None]
+
+class Camera:
+    """A perspective camera: frustum tests and projected sizes for many spheres at once"""
+    def __init__(self, fovy, aspect, near, far, eye, center, up, viewport_height):
+        self.view = look_at(eye, center, up)
+        self.projection = perspective(fovy, aspect, near, far)
+        self.planes = frustum_planes(self.projection @ self.view)
+        self.near = near
+        # Pixels covered by one world unit at view distance 1
+        self.pixels_per_unit = viewport_height / 2 / math.tan(math.radians(fovy) / 2)
+
+    def distances(self, x, y, z):
+        """(6, n) signed distances of the points to each frustum plane"""
+        planes = self.planes
+        return (planes[:, 0:1] * x + planes[:, 1:2] * y + planes[:, 2:3] * z + planes[:, 3:4])
+
+    def visible(self, x, y, z, radius):
+        """Mask of spheres at least partly inside the frustum"""
+        return np.all(self.distances(x, y, z) > -radius, axis=0)
+
+    def pixel_radius(self, x, y, z, radius):
+        """Approximate on-screen radius in pixels of each sphere (inf when it reaches the near plane)"""
+        view = self.view
+        depth = -(view[2, 0] * x + view[2, 1] * y + view[2, 2] * z + view[2, 3])
+        close = depth <= np.maximum(radius, self.near)
+        return np.where(close, np.inf, radius * self.pixels_per_unit / np.where(close, 1.0, depth))
+
+# =========================
+# MESHES
+# =========================
+# Triangle lists (vertices, normals as (n, 3) float32 arrays) matching the GLUT
+# solids, for drawing with vertex arrays where GLUT isn't available (offscreen).
+
+def grid_triangles(points, normals):
+    """Two triangles per cell of a (rows, cols, 3) grid of points"""
+    a = points[:-1, :-1]
+    b = points[1:, :-1]
+    c = points[1:, 1:]
+    d = points[:-1, 1:]
+    na, nb, nc, nd = normals[:-1, :-1], normals[1:, :-1], normals[1:, 1:], normals[:-1, 1:]
+    vertices = np.stack([a, b, c, a, c, d], axis=2).reshape(-1, 3)
+    vertex_normals = np.stack([na, nb, nc, na, nc, nd], axis=2).reshape(-1, 3)
+    return vertices.astype(np.float32), vertex_normals.astype(np.float32)
+
+def sphere_mesh(slices, stacks):
+    """Unit sphere around the z axis, like glutSolidSphere(1, slices, stacks)"""
+    theta = np.linspace(0, math.pi, stacks + 1)[:, None]
+    phi = np.linspace(0, 2 * math.pi, slices + 1)[None, :]
+    points = np.stack(np.broadcast_arrays(np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi),
+                                          np.cos(theta)), axis=-1)
+    return grid_triangles(points, points)
+
+def torus_mesh(inner_radius, outer_radius, sides, rings):
+    """Torus around the z axis, like glutSolidTorus"""
+    side = np.linspace(0, 2 * math.pi, sides + 1)[None, :]
+    ring = np.linspace(0, 2 * math.pi, rings + 1)[:, None]
+    normals = np.stack(np.broadcast_arrays(np.cos(side) * np.cos(ring), np.cos(side) * np.sin(ring),
+                                           np.sin(side)), axis=-1)
+    centre = np.stack(np.broadcast_arrays(np.cos(ring), np.sin(ring), 0 * side), axis=-1) * outer_radius
+    return grid_triangles(centre + normals * inner_radius, normals)
+
+def cube_mesh():
+    """Unit cube centred on the origin, like glutSolidCube(1)"""
+    vertices = []
+    normals = []
+    for axis in range(3):
+        for sign in (-1.0, 1.0):
+            normal = np.zeros(3)
+            normal[axis] = sign
+            u = np.zeros(3)
+            v = np.zeros(3)
+            u[(axis + 1) % 3] = 0.5
+            v[(axis + 2) % 3] = 0.5 * sign  # Keeps every face wound counter-clockwise
+            centre = normal * 0.5
+            corners = [centre - u - v, centre + u - v, centre + u + v, centre - u + v]
+            vertices += [corners[0], corners[1], corners[2], corners[0], corners[2], corners[3]]
+            normals += [normal] * 6
+    return np.array(vertices, np.float32), np.array(normals, np.float32)
+
+def rotation_matrices(axis, degrees):
+    """(n, 3, 3) rotations by `degrees` (n,) about one `axis`, like glRotatef"""
+    x, y, z = np.asarray(axis, float) / np.linalg.norm(axis)
+    angle = np.radians(degrees)
+    c = np.cos(angle)[:, None, None]
+    s = np.sin(angle)[:, None, None]
+    outer = np.array([[x * x, x * y, x * z], [y * x, y * y, y * z], [z * x, z * y, z * z]])
+    cross = np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]])
+    return c * np.identity(3) + s * cross + (1 - c) * outer
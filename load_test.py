@@ -0,0 +1,148 @@
+"""Load test for server.py: many stand-in clients playing at once.
+
+    python load_test.py --sessions 200 --duration 20 --spawn-server
+    python load_test.py --sessions 50 --port 7777     # against a running server
+
+Each client says HELLO with its own seed, clicks to start, then sends random
+actions at --actions-per-second while decoding every STATE it receives (as a
+thin client would before drawing). Near the end a monitoring connection asks
+the server for its METRICS, and the per-session tick times and sessions per
+core are printed. Clients on the same machine take CPU from the server, so
+sessions/core is a lower bound unless the server has a core to itself.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import server
+from simulation import ACTIONS
+
+PLAY_ACTIONS = [ACTIONS.index(name) for name in ("up", "down", "left", "right", "shoot")]
+CLICK = ACTIONS.index("click")
+
+class ClientStats:
+    def __init__(self):
+        self.states = 0
+        self.bytes = 0
+        self.restarts = 0
+        self.last_tick = 0
+
+async def send_actions(writer, rng, rate, stop):
+    """Random play actions at about `rate` per second until `stop` is set"""
+    while not stop.is_set():
+        writer.write(server.frame(server.INPUT, bytes([rng.choice(PLAY_ACTIONS)])))
+        await asyncio.sleep(rng.expovariate(rate))
+
+async def run_client(host, port, seed, duration, rate):
+    reader, writer = await asyncio.open_connection(host, port)
+    stats = ClientStats()
+    writer.write(server.frame(server.HELLO, server.SEED.pack(seed)))
+    kind, _ = await server.read_frame(reader)
+    if kind != server.WELCOME:
+        raise RuntimeError("expected WELCOME, got message type " + str(kind))
+    writer.write(server.frame(server.INPUT, bytes([CLICK])))
+
+    stop = asyncio.Event()
+    sender = asyncio.create_task(send_actions(writer, random.Random(seed), rate, stop))
+    deadline = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < deadline:
+            kind, payload = await server.read_frame(reader)
+            if kind != server.STATE:
+                continue
+            state = server.decode_state(payload)
+            stats.states += 1
+            stats.bytes += len(payload) + server.FRAME.size
+            stats.last_tick = state["tick"]
+            if state["flags"] & server.FLAG_GAME_OVER:
+                writer.write(server.frame(server.INPUT, bytes([CLICK])))
+                stats.restarts += 1
+    finally:
+        stop.set()
+        await sender
+        writer.close()
+    return stats
+
+async def query_metrics(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(server.frame(server.METRICS))
+    kind, payload = await server.read_frame(reader)
+    writer.close()
+    return json.loads(payload)
+
+async def run(args):
+    clients = []
+    for i in range(args.sessions):
+        clients.append(asyncio.create_task(
+            run_client(args.host, args.port, args.seed + i, args.duration, args.actions_per_second)))
+        await asyncio.sleep(args.ramp / max(1, args.sessions))
+    await asyncio.sleep(max(0.0, args.duration - args.ramp - 1.0))
+    metrics = await query_metrics(args.host, args.port)  # Sampled while every client is still playing
+    return await asyncio.gather(*clients), metrics
+
+def wait_for_server(host, port, timeout=10.0):
+    async def probe():
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.close()
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            asyncio.run(probe())
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            time.sleep(0.1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in clients for load testing server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=server.PORT)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds each client plays")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which clients connect")
+    parser.add_argument("--actions-per-second", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0, help="client i plays seed + i")
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="start server.py in a subprocess for the run")
+    args = parser.parse_args()
+
+    process = None
+    if args.spawn_server:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+        process = subprocess.Popen([sys.executable, script, "--host", args.host, "--port", str(args.port)])
+        wait_for_server(args.host, args.port)
+    try:
+        results, metrics = asyncio.run(run(args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    states = np.array([stats.states for stats in results], float)
+    received = sum(stats.bytes for stats in results)
+    per_session = metrics["per_session"]
+    mean_ms = np.array([session["mean_ms"] for session in per_session])
+    p99_ms = np.array([session["p99_ms"] for session in per_session])
+    print(str(args.sessions) + " clients for " + str(args.duration) + " s")
+    print("  states/client/s   mean " + str(round(states.mean() / args.duration, 1)) +
+          "   min " + str(round(states.min() / args.duration, 1)) +
+          "   (server ticks at " + str(metrics["tick_hz"]) + " Hz)")
+    print("  received          " + str(round(received / args.duration / 1024, 1)) + " KiB/s total")
+    print("  restarts          " + str(sum(stats.restarts for stats in results)))
+    if len(per_session):
+        print("  tick per session  mean " + str(round(float(mean_ms.mean()), 4)) + " ms" +
+              "   p99 " + str(round(float(np.percentile(p99_ms, 99)), 4)) + " ms")
+    print("  server load       " + str(round(metrics["load"] * 100, 1)) + "%" +
+          "   dropped ticks " + str(metrics["dropped_ticks"]))
+    print("  sessions/core     ~" + str(metrics["sessions_per_core"]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Offscreen rendering: run radhika1's display() without a window or X server.
+
+Frames are rendered into an EGL pbuffer (Mesa's surfaceless platform, so a
+software llvmpipe context works on machines with no display or GPU) and
+written out at chosen simulation ticks.
+
+    python offscreen.py --ticks 60,600,1200 --out frames
+    python offscreen.py --replay session.cfr --ticks 300 --format raw
+    python offscreen.py --ticks 600 --bench 200    # ms per display() frame
+
+GLUT isn't initialized here, so solids are drawn from geometry.py meshes and
+bitmap text (HUD, menus) is left out of the captured frames.
+"""
+import argparse
+import ctypes
+import os
+import struct
+import time
+import zlib
+
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")  # Before anything imports OpenGL
+
+from OpenGL import EGL
+from OpenGL.GL import *
+
+import numpy as np
+
+import radhika1
+from simulation import World
+from replay import Replay, Player
+
+EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+
+# =========================
+# CONTEXT
+# =========================
+
+def create_context(width, height):
+    """Make a desktop-GL context with a width x height pbuffer current; returns the display"""
+    display = EGL.EGL_NO_DISPLAY
+    try:
+        display = EGL.eglGetPlatformDisplay(EGL_PLATFORM_SURFACELESS_MESA, EGL.EGL_DEFAULT_DISPLAY, None)
+    except Exception:
+        pass  # No EGL 1.5 / Mesa platform: try the default display
+    if display == EGL.EGL_NO_DISPLAY:
+        display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    if not EGL.eglInitialize(display, None, None):
+        raise RuntimeError("eglInitialize failed")
+
+    attributes = [EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                  EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+                  EGL.EGL_DEPTH_SIZE, 24,
+                  EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT, EGL.EGL_NONE]
+    config = EGL.EGLConfig()
+    count = EGL.EGLint()
+    EGL.eglChooseConfig(display, (EGL.EGLint * len(attributes))(*attributes),
+                        ctypes.pointer(config), 1, ctypes.pointer(count))
+    if count.value == 0:
+        raise RuntimeError("no EGL config with an RGB pbuffer and a depth buffer")
+
+    size = [EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE]
+    surface = EGL.eglCreatePbufferSurface(display, config, (EGL.EGLint * len(size))(*size))
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+    if not EGL.eglMakeCurrent(display, surface, surface, context):
+        raise RuntimeError("eglMakeCurrent failed")
+    return display
+
+# =========================
+# FRAMES
+# =========================
+
+def read_frame(width, height):
+    """The rendered frame as a (height, width, 3) uint8 array, top row first"""
+    glPixelStorei(GL_PACK_ALIGNMENT, 1)
+    data = glReadPixels(0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE)
+    return np.frombuffer(data, np.uint8).reshape(height, width, 3)[::-1]
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def write_png(path, pixels):
+    """8-bit RGB PNG (no filtering)"""
+    height, width, _ = pixels.shape
+    rows = np.zeros((height, 1 + width * 3), np.uint8)  # Filter byte 0 before each row
+    rows[:, 1:] = pixels.reshape(height, -1)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)))
+        f.write(png_chunk(b"IEND", b""))
+
+def write_raw(path, pixels):
+    """Bare RGB bytes, top row first"""
+    with open(path, "wb") as f:
+        f.write(pixels.tobytes())
+
+def render(width, height):
+    """Draw the current world state (exactly on its last tick) and read it back"""
+    radhika1.world.alpha = 1.0
+    radhika1.display()
+    glFinish()
+    return read_frame(width, height)
+
+def run_to(world, tick):
+    """Step the world up to `tick`; False if it stopped first (game over)"""
+    game_state = world.game_state
+    while game_state["tick"] < tick:
+        before = game_state["tick"]
+        world.step()
+        if game_state["tick"] == before:
+            return False
+    return True
+
+# =========================
+# MAIN
+# =========================
+
+def parse_size(text):
+    width, _, height = text.partition("x")
+    return int(width), int(height)
+
+def main():
+    parser = argparse.ArgumentParser(description="Render game frames offscreen (no window, no X)")
+    parser.add_argument("--ticks", default="60", help="comma-separated simulation ticks to capture")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", default=None, help="drive the game from a recording instead")
+    parser.add_argument("--out", default="frames", help="output directory")
+    parser.add_argument("--format", choices=["png", "raw"], default="png")
+    parser.add_argument("--size", type=parse_size, default=(radhika1.WINDOW_W, radhika1.WINDOW_H),
+                        metavar="WxH")
+    parser.add_argument("--camera", choices=["third_person", "first_person"], default="third_person")
+    parser.add_argument("--bench", type=int, default=0, metavar="FRAMES",
+                        help="also time FRAMES redraws of the last captured tick")
+    args = parser.parse_args()
+
+    width, height = args.size
+    create_context(width, height)
+    radhika1.offscreen = True
+    radhika1.WINDOW_W, radhika1.WINDOW_H = width, height
+    radhika1.init_gl()
+    radhika1.reshape(width, height)
+
+    if args.replay is not None:
+        world = Player(Replay.load(args.replay)).world
+    else:
+        world = World(args.seed)
+        world.apply_action("click")
+    radhika1.use_world(world)
+    world.game_state["camera_mode"] = args.camera
+
+    os.makedirs(args.out, exist_ok=True)
+    for tick in sorted(int(tick) for tick in args.ticks.split(",")):
+        if not run_to(world, tick):
+            print("Game stopped at tick " + str(world.game_state["tick"]) + " before " + str(tick))
+            break
+        pixels = render(width, height)
+        if args.format == "png":
+            path = os.path.join(args.out, "tick%06d.png" % tick)
+            write_png(path, pixels)
+        else:
+            path = os.path.join(args.out, "tick%06d_%dx%d.rgb" % (tick, width, height))
+            write_raw(path, pixels)
+        print("Wrote " + path)
+
+    if args.bench:
+        render(width, height)  # Warm the mesh cache
+        start = time.perf_counter()
+        for _ in range(args.bench):
+            render(width, height)
+        elapsed = time.perf_counter() - start
+        print(str(args.bench) + " frames at " + str(width) + "x" + str(height) + ": " +
+              str(round(elapsed / args.bench * 1000.0, 3)) + " ms/frame (" +
+              glGetString(GL_RENDERER).decode() + ")")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Per-phase frame profiler with Chrome trace-event export.
+
+Wrap a phase in `with profiler.span("name"):`. While the profiler is
+disabled span() hands back one shared no-op context manager, so
+instrumented code costs a method call per phase and nothing more.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+
+NULL_SPAN = contextlib.nullcontext()
+MAX_TRACE_EVENTS = 2000000  # ~15 spans/frame at 60 FPS is about 35 minutes
+MAX_HANDOFF = 4096  # Spans from other threads waiting for the next end_frame
+
+class Span:
+    """Times one phase and reports it to its profiler on exit"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+class Profiler:
+    """Rolling per-phase milliseconds and FPS, optionally kept as a trace.
+    Only the thread that created it changes its state: spans finished on
+    other threads (the simulation thread) are queued on a deque, whose
+    append/popleft are atomic, and folded in by the next end_frame()."""
+    def __init__(self, history=120):
+        self.enabled = False
+        self.history = history
+        self.phases = {}  # name -> deque of per-frame ms
+        self.frame = {}  # name -> ms so far this frame
+        self.frame_starts = deque(maxlen=history)
+        self.trace = None  # [(name, start, end, thread id)] while tracing
+        self.epoch = time.perf_counter()
+        self.owner = threading.get_ident()
+        self.handoff = deque(maxlen=MAX_HANDOFF)  # (name, start, end, thread id) from other threads
+
+    def span(self, name):
+        """Context manager timing `name` (no-op while disabled)"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def record(self, name, start, end):
+        """Add one finished span (or queue it, from another thread)"""
+        thread = threading.get_ident()
+        if thread != self.owner:
+            self.handoff.append((name, start, end, thread))
+            return
+        self.add(name, start, end, thread)
+
+    def add(self, name, start, end, thread):
+        self.frame[name] = self.frame.get(name, 0.0) + (end - start) * 1000.0
+        if self.trace is not None and len(self.trace) < MAX_TRACE_EVENTS:
+            self.trace.append((name, start, end, thread))
+
+    def drain(self):
+        """Fold in the spans other threads have handed over"""
+        handoff = self.handoff
+        while handoff:
+            self.add(*handoff.popleft())
+
+    def end_frame(self):
+        """Close the current frame: push its phase totals into the rolling history"""
+        self.drain()
+        if not self.enabled:
+            return
+        self.frame_starts.append(time.perf_counter())
+        for name in self.frame:
+            if name not in self.phases:
+                self.phases[name] = deque(maxlen=self.history)
+        for name, samples in self.phases.items():
+            samples.append(self.frame.get(name, 0.0))
+        self.frame = {}
+
+    # -------------------------
+    # Readouts
+    # -------------------------
+
+    def fps(self):
+        """Frames per second over the rolling history"""
+        if len(self.frame_starts) < 2:
+            return 0.0
+        return (len(self.frame_starts) - 1) / max(self.frame_starts[-1] - self.frame_starts[0], 1e-9)
+
+    def averages(self):
+        """[(phase, mean ms per frame)] in first-seen order"""
+        return [(name, sum(samples) / len(samples)) for name, samples in self.phases.items() if samples]
+
+    # -------------------------
+    # Chrome trace
+    # -------------------------
+
+    def start_trace(self):
+        """Keep every span from now on (implies enabled)"""
+        self.enabled = True
+        self.trace = []
+
+    def save_trace(self, path):
+        """Write the kept spans as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        self.drain()
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "pid": pid, "tid": tid,
+                   "ts": (start - self.epoch) * 1e6, "dur": (end - start) * 1e6}
+                  for name, start, end, tid in self.trace or []]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
@@ -0,0 +1,107 @@
+"""Adaptive render quality: watches frame times and moves between quality
+levels to hold a frame budget (no OpenGL imports).
+
+Only how much of the scene gets drawn changes (stars and nebulas drawn,
+particles per explosion, sphere tessellation, projectile trails); the World
+is never touched, so gameplay, replays and state hashes don't depend on it.
+
+Hysteresis keeps the level from oscillating:
+  * step down when the recent average exceeds budget * DOWNGRADE_RATIO
+  * step up when it stays under budget * UPGRADE_RATIO for UPGRADE_DELAY
+  * otherwise, below full quality, probe one level up every probe interval.
+    A probe that has to be undone within PROBE_GRACE doubles the interval,
+    so a machine that just can't hold the next level stops trying it.
+Probing is what lets quality recover when frames are pinned to the
+display's refresh rate and never look much cheaper than the budget.
+"""
+from collections import deque
+
+FRAME_BUDGET_MS = 1000.0 / 60
+FRAME_WINDOW = 30  # Frame intervals averaged before each decision
+MAX_FRAME_MS = 250.0  # Longer gaps (pause, menus, window drags) are ignored
+DOWNGRADE_RATIO = 1.15
+UPGRADE_RATIO = 0.75
+UPGRADE_DELAY = 2.0  # Seconds under the upgrade threshold before stepping up
+PROBE_INTERVAL = 10.0  # Seconds within budget before trying one level up
+MAX_PROBE_INTERVAL = 160.0
+PROBE_GRACE = 3.0  # A downgrade this soon after a probe counts as a failed probe
+
+class QualityLevel:
+    """What one quality level draws"""
+    def __init__(self, star_fraction, particle_stride, detail, trail_spheres, nebula_count):
+        self.star_fraction = star_fraction  # Share of the starfield drawn
+        self.particle_stride = particle_stride  # Draw every n-th particle slot
+        self.detail = detail  # LOD levels added to every body (halves tessellation each)
+        self.trail_spheres = trail_spheres  # Spheres behind each projectile
+        self.nebula_count = nebula_count  # Nebulas drawn (None: all)
+
+# Lowest first; the last level is the game's full quality
+QUALITY_LEVELS = (
+    QualityLevel(0.25, 3, 2, 0, 0),
+    QualityLevel(0.5, 2, 1, 1, 2),
+    QualityLevel(0.75, 1, 1, 2, 4),
+    QualityLevel(1.0, 1, 0, 3, None)
+)
+
+class QualityController:
+    """Feed it frame() once per drawn frame; read .settings when drawing"""
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, level=None, adaptive=True):
+        self.budget_ms = budget_ms
+        self.adaptive = adaptive
+        self.level = len(QUALITY_LEVELS) - 1 if level is None else level
+        self.settings = QUALITY_LEVELS[self.level]
+        self.samples = deque(maxlen=FRAME_WINDOW)
+        self.last_frame = None
+        self.now = 0.0  # Seconds of counted frame time (pauses excluded)
+        self.changed_at = 0.0
+        self.under_since = None  # When the average last went under the upgrade threshold
+        self.probe_interval = PROBE_INTERVAL
+        self.probed_at = None  # When the current level was reached by a probe
+        self.changes = 0
+
+    def frame(self, now):
+        """Record a frame drawn at `now` (seconds, e.g. time.perf_counter())"""
+        last, self.last_frame = self.last_frame, now
+        if last is None:
+            return
+        frame_ms = (now - last) * 1000.0
+        if frame_ms > MAX_FRAME_MS:
+            return
+        self.now += frame_ms / 1000.0
+        self.samples.append(frame_ms)
+        if self.adaptive and len(self.samples) == FRAME_WINDOW:
+            self.update(sum(self.samples) / FRAME_WINDOW)
+
+    def average_ms(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def update(self, average):
+        now = self.now
+        if average > self.budget_ms * DOWNGRADE_RATIO:
+            if self.level > 0:
+                if self.probed_at is not None and now - self.probed_at < PROBE_GRACE:
+                    self.probe_interval = min(self.probe_interval * 2, MAX_PROBE_INTERVAL)
+                self.set_level(self.level - 1)
+            return
+        if self.level == len(QUALITY_LEVELS) - 1:
+            return
+        if average < self.budget_ms * UPGRADE_RATIO:
+            if self.under_since is None:
+                self.under_since = now
+            if now - self.under_since >= UPGRADE_DELAY:
+                self.set_level(self.level + 1)
+            return
+        self.under_since = None
+        if now - self.changed_at >= self.probe_interval:
+            self.set_level(self.level + 1)
+            self.probed_at = now
+
+    def set_level(self, level):
+        """Switch levels and start measuring afresh"""
+        self.level = max(0, min(level, len(QUALITY_LEVELS) - 1))
+        self.settings = QUALITY_LEVELS[self.level]
+        self.samples.clear()
+        self.changed_at = self.now
+        self.under_since = None
+        self.probed_at = None
+        self.changes += 1
@@ -1,19 +1,27 @@
+import time
+# (phase, perf_counter at its end) from process start to the first gameplay
+# frame, printed by --startup-profile
+startup_marks = [("start", time.perf_counter())]
+
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GLUT import *
-import random
-import time
+startup_marks.append(("import OpenGL", time.perf_counter()))
 import math
 import sys
+import atexit
 
-# Window and World Configuration
-WINDOW_W, WINDOW_H = 1200, 900
-WORLD_W, WORLD_H, WORLD_D = 1000.0, 700.0, 1000.0
+import numpy as np
 
-# Game Configuration
-INITIAL_LIVES = 3
-INITIAL_AMMO = 20
-AMMO_RECHARGE_TIME = 3.0  # Seconds to recharge 1 ammo
+from simulation import World, Obstacle, FIXED_DT
+from replay import Recorder
+from sim_thread import SimulationThread
+from geometry import Camera, sphere_mesh, cube_mesh, torus_mesh, rotation_matrices
+from quality import QualityController, QUALITY_LEVELS
+startup_marks.append(("import game modules", time.perf_counter()))
+
+# Window Configuration
+WINDOW_W, WINDOW_H = 1200, 900
 
 # Background Colors (will change with levels)
 BG_COLORS = {
@@ -22,603 +30,401 @@ BG_COLORS = {
     3: {"top": [0.25, 0.1, 0.1], "bot": [0.1, 0.0, 0.0]}      # Red danger zone
 }
 
-# Global Game State
-game_state = {
-    "in_start_screen": True,
-    "game_over": False,
-    "paused": False,
-    "level": 1,
-    "score": 0,
-    "lives": INITIAL_LIVES,
-    "ammo": INITIAL_AMMO,
-    "last_ammo_recharge": 0.0,
-    "camera_mode": "third_person",  # or "first_person"
-    "last_time": 0.0,
-    "show_instructions": False
-}
+# Camera projection (set_camera) and the Camera it builds for culling
+FOVY, NEAR, FAR = 60.0, 1.0, 2000.0
+camera = None
 
-# Spaceship Configuration
-spaceship = {
-    "x": -200.0,
-    "y": 0.0,
-    "z": 0.0,
-    "rotation": 0.0,
-    "speed": 300.0,  # Movement speed
-    "health": 100,
-    "max_health": 100,
-    "shield_active": False,
-    "shield_time": 0.0
+# Level of detail: bodies whose bounding sphere covers fewer on-screen pixels
+# (radius) than these thresholds get half, then a quarter of the tessellation
+LOD_PIXELS = (48.0, 16.0)
+MIN_SEGMENTS = 6
+
+# Obstacle shapes: glRotatef axis (None: not rotated) and unit-mesh scale per unit of size
+OBSTACLE_SHAPES = {
+    "cube": ((1, 1, 0), 1.0),
+    "sphere": (None, 0.5),
+    "pyramid": ((0, 1, 0), 0.5),
+    "torus": ((1, 0, 1), 0.5)
+}
+# Four-sided pyramid with half-size 1 (apex up)
+PYRAMID_TRIANGLES = np.array([
+    [0, 1, 0], [-1, -1, 1], [1, -1, 1],
+    [0, 1, 0], [1, -1, 1], [1, -1, -1],
+    [0, 1, 0], [1, -1, -1], [-1, -1, -1],
+    [0, 1, 0], [-1, -1, -1], [-1, -1, 1]
+], np.float32)
+obstacle_meshes = {}  # (shape, LOD level) -> (unit mesh vertices, triangle indices)
+obstacle_indices = {}  # (shape, LOD level) -> indices of many consecutive mesh copies
+# Reused vertex/color buffers for draw_obstacles (grown when needed)
+obstacle_batch = {
+    "vertices": np.zeros((0, 3), np.float32),
+    "colors": np.zeros((0, 3), np.float32)
 }
 
-# Collections
-stars = []
-nebulas = []
-planets = []
-obstacles = []
-projectiles = []
-powerups = []
-particles = []
-
-# Level Configuration
-LEVEL_CONFIG = {
-    1: {
-        "obstacle_speed": 200.0,
-        "obstacle_count": 15,
-        "obstacle_health": 1,
-        "spawn_penalty_obstacles": False,
-        "penalty_ratio": 0.0
-    },
-    2: {
-        "obstacle_speed": 280.0,
-        "obstacle_count": 20,
-        "obstacle_health": 1,
-        "spawn_penalty_obstacles": True,
-        "penalty_ratio": 0.3  # 30% of obstacles are penalty
-    },
-    3: {
-        "obstacle_speed": 400.0,
-        "obstacle_count": 25,
-        "obstacle_health": 3,  # Require multiple hits
-        "spawn_penalty_obstacles": True,
-        "penalty_ratio": 0.25
-    }
+# Particles are drawn as points: PARTICLE_POINT_SIZE pixels at distance
+# 1 / sqrt(attenuation[2]), i.e. roughly a 7-unit sphere seen through set_camera
+PARTICLE_POINT_SIZE = 32.0
+PARTICLE_ATTENUATION = [0.0, 0.0, (PARTICLE_POINT_SIZE / 5500.0) ** 2]
+
+# Reused vertex/color buffers for draw_stars (grown when the starfield grows)
+star_batch = {
+    "vertices": np.zeros((0, 3), np.float32),
+    "colors": np.zeros((0, 3), np.float32),
+    "twinkle": np.zeros(0, np.float64)
 }
 
+# Render interpolation: the simulation runs in FIXED_DT ticks and display()
+# draws between the last two. Everything moves at constant velocity between
+# ticks, so lerp(previous, current, alpha) == current - velocity * render_lag.
+# The background is simply placed at sim_time - render_lag (World.place_background).
+render_lag = 0.0  # (1 - world.alpha) * FIXED_DT, set at the start of display()
+particle_positions = np.zeros((0, 3), np.float32)  # Interpolated particle buffer
+
+# Set by main() when watching a recording (replay.Player)
+replay_player = None
+
+# Set by main() for live play: steps the world on its own thread, while GLUT
+# only draws its latest RenderFrame and posts input to it (--single-thread: off)
+simulation_thread = None
+
+# Set by offscreen.py, which renders without GLUT: solids are then drawn from
+# geometry.py meshes, bitmap text is skipped and frames are read back, not swapped
+offscreen = False
+
+# Adaptive render quality (star/nebula counts, particles, tessellation, trails):
+# display() reports each gameplay frame; --frame-budget MS / --quality LEVEL in main()
+quality = QualityController()
+
+# Frame profiler overlay (F key); phases are timed by world.profiler
+show_profiler = False
+PROFILER_PANEL_W = 260
+
+# Simulation world (game_state/spaceship are the world's own dicts)
+world = World()
+game_state = world.game_state
+spaceship = world.spaceship
+startup_marks.append(("create world", time.perf_counter()))
+startup_profile = False  # Set by main() for --startup-profile
+
 # =========================
-# HELPER CLASSES
+# MESH CACHE
 # =========================
+# Every mesh is tessellated once into a display list and replayed after that.
+# Primitives are compiled at unit size and scaled, so one list serves every
+# obstacle/planet size; only (shape, slices, stacks) need their own list.
 
-class Star:
-    def __init__(self):
-        self.x = random.uniform(-WORLD_W/2, WORLD_W/2)
-        self.y = random.uniform(-WORLD_H/2, WORLD_H/2)
-        self.z = random.uniform(-800, 800)
-        self.brightness = random.uniform(0.3, 1.0)
-        self.twinkle_speed = random.uniform(0.5, 2.0)
-        self.twinkle_offset = random.uniform(0, 6.28)
-    
-    def update(self, dt):
-        if not game_state["paused"]:
-            self.x -= 80 * dt
-            if self.x < -WORLD_W/2 - 100:
-                self.x = WORLD_W/2 + 100
-                self.y = random.uniform(-WORLD_H/2, WORLD_H/2)
-
-class Nebula:
-    def __init__(self):
-        self.x = random.uniform(-WORLD_W/2, WORLD_W/2)
-        self.y = random.uniform(-WORLD_H/2, WORLD_H/2)
-        self.z = random.uniform(-600, -200)
-        self.size = random.uniform(40, 80)
-        self.color = [
-            random.uniform(0.3, 0.8),
-            random.uniform(0.1, 0.5),
-            random.uniform(0.5, 1.0)
-        ]
-        self.rotation = random.uniform(0, 360)
-    
-    def update(self, dt):
-        if not game_state["paused"]:
-            self.x -= 40 * dt
-            self.rotation += 10 * dt
-            if self.x < -WORLD_W/2 - 100:
-                self.x = WORLD_W/2 + 100
-
-class Planet:
-    def __init__(self):
-        self.x = random.uniform(-WORLD_W/2, WORLD_W/2)
-        self.y = random.uniform(-WORLD_H/2, WORLD_H/2)
-        self.z = random.uniform(-500, -200)
-        self.size = random.uniform(30, 60)
-        self.color = [random.uniform(0.2, 0.9) for _ in range(3)]
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(5, 15)
-    
-    def update(self, dt):
-        if not game_state["paused"]:
-            self.x -= 60 * dt
-            self.rotation += self.rotation_speed * dt
-            if self.x < -WORLD_W/2 - 100:
-                self.x = WORLD_W/2 + 100
-
-class Obstacle:
-    def __init__(self, level=1, is_penalty=False):
-        self.x = WORLD_W/2 + 200
-        self.y = random.uniform(-WORLD_H/2 + 100, WORLD_H/2 - 100)
-        self.z = random.uniform(-170, 170)
-        self.size = random.uniform(15, 30)
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(30, 100)
-        
-        # Level-based properties
-        config = LEVEL_CONFIG[level]
-        self.health = config["obstacle_health"]
-        self.max_health = config["obstacle_health"]
-        self.speed = config["obstacle_speed"]
-        
-        # Penalty obstacle (RED - shooting causes damage)
-        self.is_penalty = is_penalty
-        if is_penalty:
-            self.color = [1.0, 0.0, 0.0]  # Red
-            self.glow_phase = random.uniform(0, 6.28)
-        else:
-            # Normal obstacles (various colors)
-            self.color = [
-                random.uniform(0.3, 0.9),
-                random.uniform(0.3, 0.9),
-                random.uniform(0.3, 0.9)
-            ]
-        
-        # Obstacle type (visual variety)
-        self.shape = random.choice(['cube', 'sphere', 'pyramid', 'torus'])
-    
-    def update(self, dt):
-        if not game_state["paused"]:
-            self.x -= self.speed * dt
-            self.rotation += self.rotation_speed * dt
-            if self.is_penalty:
-                self.glow_phase += dt * 3
-    
-    def draw(self):
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        
-        # Glow effect for penalty obstacles
-        if self.is_penalty:
-            glow = 0.5 + 0.5 * math.sin(self.glow_phase)
-            glColor3f(1.0, glow * 0.3, glow * 0.3)
-        else:
-            # Health-based color intensity
-            intensity = self.health / self.max_health
-            glColor3f(self.color[0] * intensity, 
-                     self.color[1] * intensity, 
-                     self.color[2] * intensity)
-        
-        if self.shape == 'cube':
-            glRotatef(self.rotation, 1, 1, 0)
-            glutSolidCube(self.size)
-        elif self.shape == 'sphere':
-            glutSolidSphere(self.size/2, 15, 15)
-        elif self.shape == 'pyramid':
-            glRotatef(self.rotation, 0, 1, 0)
-            glBegin(GL_TRIANGLES)
-            # Draw pyramid
-            s = self.size/2
-            glVertex3f(0, s, 0)
-            glVertex3f(-s, -s, s)
-            glVertex3f(s, -s, s)
-            
-            glVertex3f(0, s, 0)
-            glVertex3f(s, -s, s)
-            glVertex3f(s, -s, -s)
-            
-            glVertex3f(0, s, 0)
-            glVertex3f(s, -s, -s)
-            glVertex3f(-s, -s, -s)
-            
-            glVertex3f(0, s, 0)
-            glVertex3f(-s, -s, -s)
-            glVertex3f(-s, -s, s)
-            glEnd()
-        elif self.shape == 'torus':
-            glRotatef(self.rotation, 1, 0, 1)
-            glutSolidTorus(self.size/4, self.size/2, 10, 15)
-        
-        glPopMatrix()
-        
-        # Draw health bar for obstacles with health > 1
-        if self.max_health > 1:
-            self.draw_health_bar()
-    
-    def draw_health_bar(self):
-        glPushMatrix()
-        glTranslatef(self.x, self.y + self.size + 10, self.z)
-        
-        # Background
-        glColor3f(0.2, 0.2, 0.2)
-        glBegin(GL_QUADS)
-        glVertex3f(-15, 0, 0)
-        glVertex3f(15, 0, 0)
-        glVertex3f(15, 3, 0)
-        glVertex3f(-15, 3, 0)
-        glEnd()
-        
-        # Health
-        health_width = 30 * (self.health / self.max_health)
-        if self.health / self.max_health > 0.5:
-            glColor3f(0.0, 1.0, 0.0)
-        elif self.health / self.max_health > 0.25:
-            glColor3f(1.0, 1.0, 0.0)
-        else:
-            glColor3f(1.0, 0.0, 0.0)
-        
-        glBegin(GL_QUADS)
-        glVertex3f(-15, 0, 0)
-        glVertex3f(-15 + health_width, 0, 0)
-        glVertex3f(-15 + health_width, 3, 0)
-        glVertex3f(-15, 3, 0)
-        glEnd()
-        
-        glPopMatrix()
-
-class Projectile:
-    def __init__(self, x, y, z):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.speed = 600.0
-        self.life = 2.0  # Seconds before disappearing
-    
-    def update(self, dt):
-        if not game_state["paused"]:
-            self.x += self.speed * dt
-            self.life -= dt
-    
-    def draw(self):
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        
-        # Glowing projectile
-        glColor3f(0.0, 1.0, 1.0)
-        glutSolidSphere(3, 8, 8)
-        
-        # Trail effect
-        glColor4f(0.0, 0.8, 1.0, 0.3)
-        for i in range(1, 4):
-            glPushMatrix()
-            glTranslatef(-i * 8, 0, 0)
-            glutSolidSphere(2, 6, 6)
-            glPopMatrix()
-        
-        glPopMatrix()
+# Display list ids, keyed by ("sphere", slices, stacks), ("spaceship",), ...
+mesh_cache = {}
+text_fields = {}  # draw_text field -> (text, display list id)
+compiling_mesh = False  # GL can't nest glNewList: meshes built inside another are inlined
 
-class PowerUp:
-    """NEW FEATURE 1: Power-ups that spawn randomly"""
-    def __init__(self):
-        self.x = WORLD_W/2 + 200
-        self.y = random.uniform(-WORLD_H/2 + 100, WORLD_H/2 - 100)
-        self.z = random.uniform(-30, 30)
-        self.size = 15
-        self.rotation = 0
-        self.type = random.choice(['ammo', 'shield', 'health'])
-        self.collected = False
-        self.bob_offset = random.uniform(0, 6.28)
-    
-    def update(self, dt):
-        if not game_state["paused"] and not self.collected:
-            self.x -= 150 * dt
-            self.rotation += 180 * dt
-            self.bob_offset += dt * 2
-    
-    def draw(self):
-        if self.collected:
+def call_mesh(key, build):
+    """Replay the display list for `key`, compiling it with build() on first use"""
+    global compiling_mesh
+    list_id = mesh_cache.get(key)
+    if list_id is None:
+        if compiling_mesh:
+            build()
             return
-        
-        glPushMatrix()
-        glTranslatef(self.x, self.y + math.sin(self.bob_offset) * 5, self.z)
-        glRotatef(self.rotation, 0, 1, 0)
-        
-        if self.type == 'ammo':
-            glColor3f(1.0, 1.0, 0.0)  # Yellow
-            glutSolidCube(self.size)
-        elif self.type == 'shield':
-            glColor3f(0.0, 0.5, 1.0)  # Blue
-            glutSolidSphere(self.size/2, 12, 12)
-        elif self.type == 'health':
-            glColor3f(0.0, 1.0, 0.0)  # Green
-            glutSolidTorus(self.size/4, self.size/2, 8, 12)
-        
-        glPopMatrix()
+        list_id = glGenLists(1)
+        glNewList(list_id, GL_COMPILE)
+        compiling_mesh = True
+        try:
+            build()
+        finally:
+            compiling_mesh = False
+        glEndList()
+        mesh_cache[key] = list_id
+    glCallList(list_id)
 
-class Particle:
-    """Explosion particle effect"""
-    def __init__(self, x, y, z, color):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.vx = random.uniform(-100, 100)
-        self.vy = random.uniform(-100, 100)
-        self.vz = random.uniform(-100, 100)
-        self.life = random.uniform(0.3, 0.8)
-        self.color = color
-        self.size = random.uniform(2, 5)
-    
-    def update(self, dt):
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.z += self.vz * dt
-        self.life -= dt
-    
-    def draw(self):
-        if self.life <= 0:
-            return
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        alpha = self.life
-        glColor4f(self.color[0], self.color[1], self.color[2], alpha)
-        glutSolidSphere(self.size, 6, 6)
-        glPopMatrix()
+def warm_mesh_cache():
+    """Build every mesh the game draws up front (into a frame that display()
+    clears anyway), so the first gameplay frame doesn't compile them"""
+    call_mesh(("spaceship",), draw_spaceship_model)
+    for settings in QUALITY_LEVELS:
+        draw_projectile_model_cached(settings.trail_spheres)
+    solid_cube(1)
+    solid_sphere(1, 12, 12)
+    solid_torus(1, 2, 8, 12)  # Power-ups
+    for level in range(len(LOD_PIXELS) + 1):
+        solid_sphere(1, lod_segments(20, level), lod_segments(20, level))
+        solid_sphere(1, lod_segments(25, level), lod_segments(25, level))
+        for shape in Obstacle.SHAPES:
+            instance_indices(shape, level, 64)
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+def lod_segments(segments, lod):
+    """Tessellation for LOD level `lod` (0 = full) of a mesh with `segments` at full detail"""
+    return max(MIN_SEGMENTS, segments >> int(lod))
+
+def visible_bodies(store, radius, interpolate=True):
+    """Indices of the store's entities whose bounding spheres (`radius`, scalar or
+    per entity) are inside the view frustum, and the LOD level of each.
+    interpolate=False for stores already placed at the render time (background)."""
+    x = store.column("x")
+    if interpolate:
+        x = x - store.column("vx") * render_lag
+    y = store.column("y")
+    z = store.column("z")
+    visible = np.flatnonzero(camera.visible(x, y, z, radius))
+    if np.ndim(radius):
+        radius = radius[visible]
+    pixels = camera.pixel_radius(x[visible], y[visible], z[visible], radius)
+    lod = (pixels < LOD_PIXELS[0]).astype(np.intp) + (pixels < LOD_PIXELS[1])
+    if quality.settings.detail:
+        lod = np.minimum(lod + quality.settings.detail, len(LOD_PIXELS))
+    return visible, lod
+
+def draw_triangle_arrays(vertices, normals):
+    """Draw a geometry.py triangle mesh with vertex arrays"""
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_NORMAL_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, vertices)
+    glNormalPointer(GL_FLOAT, 0, normals)
+    glDrawArrays(GL_TRIANGLES, 0, len(vertices))
+    glDisableClientState(GL_NORMAL_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+def unit_sphere(slices, stacks):
+    if offscreen:
+        draw_triangle_arrays(*sphere_mesh(slices, stacks))
+    else:
+        glutSolidSphere(1.0, slices, stacks)
+
+def unit_cube():
+    if offscreen:
+        draw_triangle_arrays(*cube_mesh())
+    else:
+        glutSolidCube(1.0)
+
+def unit_torus(ratio, sides, rings):
+    if offscreen:
+        draw_triangle_arrays(*torus_mesh(ratio, 1.0, sides, rings))
+    else:
+        glutSolidTorus(ratio, 1.0, sides, rings)
+
+def solid_sphere(radius, slices, stacks):
+    """Cached glutSolidSphere"""
+    glPushMatrix()
+    glScalef(radius, radius, radius)
+    call_mesh(("sphere", slices, stacks), lambda: unit_sphere(slices, stacks))
+    glPopMatrix()
+
+def solid_cube(size):
+    """Cached glutSolidCube"""
+    glPushMatrix()
+    glScalef(size, size, size)
+    call_mesh(("cube",), unit_cube)
+    glPopMatrix()
+
+def solid_torus(inner_radius, outer_radius, sides, rings):
+    """Cached glutSolidTorus (one list per inner/outer ratio)"""
+    ratio = inner_radius / outer_radius
+    glPushMatrix()
+    glScalef(outer_radius, outer_radius, outer_radius)
+    call_mesh(("torus", ratio, sides, rings), lambda: unit_torus(ratio, sides, rings))
+    glPopMatrix()
 
 # =========================
-# GAME FUNCTIONS
+# DRAWING FUNCTIONS
 # =========================
 
-def initialize_scene():
-    """Initialize all scene objects"""
-    global stars, nebulas, planets, obstacles, powerups
-    
-    stars.clear()
-    nebulas.clear()
-    planets.clear()
-    obstacles.clear()
-    powerups.clear()
-    
-    # Create stars
-    for _ in range(600):
-        stars.append(Star())
-    
-    # Create nebulas
-    for _ in range(8):
-        nebulas.append(Nebula())
-    
-    # Create planets
-    for _ in range(5):
-        planets.append(Planet())
-    
-    # Create initial obstacles
-    spawn_obstacles()
+def obstacle_mesh(shape, lod):
+    """Unit mesh of an obstacle shape at LOD level `lod` as (distinct vertices,
+    triangle indices), cached; shared vertices are transformed only once"""
+    key = (shape, lod)
+    if key not in obstacle_meshes:
+        if shape == 'cube':
+            triangles = cube_mesh()[0]
+        elif shape == 'sphere':
+            triangles = sphere_mesh(lod_segments(15, lod), lod_segments(15, lod))[0]
+        elif shape == 'pyramid':
+            triangles = PYRAMID_TRIANGLES
+        else:
+            triangles = torus_mesh(0.5, 1.0, lod_segments(10, lod), lod_segments(15, lod))[0]
+        vertices, indices = np.unique(triangles, axis=0, return_inverse=True)
+        obstacle_meshes[key] = (vertices, indices.reshape(-1).astype(np.uint32))
+    return obstacle_meshes[key]
 
-def spawn_obstacles():
-    """Spawn obstacles based on current level"""
-    global obstacles
-    
-    level = game_state["level"]
-    config = LEVEL_CONFIG[level]
-    
-    obstacles.clear()
-    
-    spacing = 150.0
-    for i in range(config["obstacle_count"]):
-        is_penalty = False
-        if config["spawn_penalty_obstacles"]:
-            is_penalty = random.random() < config["penalty_ratio"]
-        
-        obs = Obstacle(level=level, is_penalty=is_penalty)
-        obs.x = WORLD_W/2 + 200 + i * spacing
-        obstacles.append(obs)
-
-def spawn_powerup():
-    """Spawn a random power-up"""
-    if random.random() < 0.15:  # 15% chance per spawn cycle
-        powerups.append(PowerUp())
-
-def create_explosion(x, y, z, color):
-    """Create particle explosion effect"""
-    for _ in range(15):
-        particles.append(Particle(x, y, z, color))
-
-def shoot_projectile():
-    """Fire a projectile from the spaceship"""
-    if game_state["ammo"] > 0 and not game_state["game_over"]:
-        proj = Projectile(
-            spaceship["x"] + 40,
-            spaceship["y"],
-            spaceship["z"]
-        )
-        projectiles.append(proj)
-        game_state["ammo"] -= 1
-
-def check_collisions():
-    """Check all collision types"""
-    ship_x, ship_y, ship_z = spaceship["x"], spaceship["y"], spaceship["z"]
-    ship_radius = 30  # Increased for better collision detection
-    
-    # Projectile vs Obstacle collisions
-    for proj in projectiles[:]:
-        if proj.life <= 0:
-            projectiles.remove(proj)
-            continue
-        
-        for obs in obstacles[:]:
-            dx = proj.x - obs.x
-            dy = proj.y - obs.y
-            dz = proj.z - obs.z
-            dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-            
-            # More lenient collision detection - increased threshold
-            collision_threshold = obs.size + 5  # Added buffer for better detection
-            if dist < collision_threshold:
-                # Hit!
-                if proj in projectiles:
-                    projectiles.remove(proj)
-                
-                if obs.is_penalty:
-                    # Penalty: lose life for shooting red obstacles
-                    game_state["lives"] -= 1
-                    spaceship["health"] -= 30
-                    create_explosion(obs.x, obs.y, obs.z, [1.0, 0.0, 0.0])
-                    if spaceship["health"] < 0:
-                        spaceship["health"] = 0
-                    if game_state["lives"] <= 0:
-                        game_state["game_over"] = True
-                    print("WARNING: Hit penalty obstacle! Lives: " + str(game_state['lives']))
-                else:
-                    # Normal obstacle: reduce health
-                    obs.health -= 1
-                    create_explosion(obs.x, obs.y, obs.z, obs.color)
-                    
-                    if obs.health <= 0:
-                        # Destroyed!
-                        obstacles.remove(obs)
-                        game_state["score"] += 10
-                        
-                        # Respawn new obstacle
-                        level = game_state["level"]
-                        config = LEVEL_CONFIG[level]
-                        is_penalty = False
-                        if config["spawn_penalty_obstacles"]:
-                            is_penalty = random.random() < config["penalty_ratio"]
-                        new_obs = Obstacle(level=level, is_penalty=is_penalty)
-                        obstacles.append(new_obs)
-                        
-                        # Check level progression
-                        if game_state["score"] >= game_state["level"] * 100 and game_state["level"] < 3:
-                            advance_level()
-                break
-    
-    # Ship vs Obstacle collisions (if shield not active)
-    if not spaceship["shield_active"]:
-        for obs in obstacles[:]:
-            dx = ship_x - obs.x
-            dy = ship_y - obs.y
-            dz = ship_z - obs.z
-            dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-            
-            # More lenient collision detection for ship
-            collision_threshold = ship_radius + obs.size + 10  # Added buffer
-            if dist < collision_threshold:
-                # Collision!
-                game_state["lives"] -= 1
-                spaceship["health"] -= 40
-                create_explosion(obs.x, obs.y, obs.z, obs.color)
-                
-                # Respawn obstacle
-                obs.x = WORLD_W/2 + 200
-                obs.y = random.uniform(-WORLD_H/2 + 100, WORLD_H/2 - 100)
-                
-                if spaceship["health"] < 0:
-                    spaceship["health"] = 0
-                
-                if game_state["lives"] <= 0:
-                    game_state["game_over"] = True
-                
-                print("COLLISION! Lives remaining: " + str(game_state['lives']) + ", Health: " + str(spaceship['health']))
-                break
-    
-    # Ship vs PowerUp collisions
-    for pup in powerups[:]:
-        if pup.collected:
-            continue
-        
-        dx = ship_x - pup.x
-        dy = ship_y - pup.y
-        dz = ship_z - pup.z
-        dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-        
-        # Increased collision range for powerups
-        powerup_collision_range = ship_radius + pup.size + 15
-        if dist < powerup_collision_range:
-            pup.collected = True
-            powerups.remove(pup)
+def instance_indices(shape, lod, count):
+    """Triangle indices for `count` consecutive copies of an obstacle mesh"""
+    vertices, indices = obstacle_mesh(shape, lod)
+    cached = obstacle_indices.get((shape, lod))
+    if cached is None or len(cached) < count * len(indices):
+        copies = max(count, 2 * len(cached) // len(indices) if cached is not None else 64)
+        offsets = np.arange(copies, dtype=np.uint32)[:, None] * np.uint32(len(vertices))
+        cached = (indices[None, :] + offsets).reshape(-1)
+        obstacle_indices[(shape, lod)] = cached
+    return cached[:count * len(indices)]
+
+def batch_buffers(count):
+    """Reused vertex/color buffers with room for `count` vertices"""
+    if len(obstacle_batch["vertices"]) < count:
+        obstacle_batch["vertices"] = np.zeros((count, 3), np.float32)
+        obstacle_batch["colors"] = np.zeros((count, 3), np.float32)
+    return obstacle_batch["vertices"][:count], obstacle_batch["colors"][:count]
+
+def draw_colored_arrays(mode, vertices, colors, indices=None):
+    """One draw call over vertex/color arrays (indexed when `indices` is given)"""
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, vertices)
+    glColorPointer(3, GL_FLOAT, 0, colors)
+    if indices is None:
+        glDrawArrays(mode, 0, len(vertices))
+    else:
+        glDrawElements(mode, len(indices), GL_UNSIGNED_INT, indices)
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+def obstacle_colors(obstacles, indices):
+    """(n, 3) colors: pulsing red for penalty obstacles, the rest dimmed by damage"""
+    arrays = obstacles.arrays
+    colors = np.stack([arrays["r"][indices], arrays["g"][indices], arrays["b"][indices]], axis=1)
+    colors *= (arrays["health"][indices] / arrays["max_health"][indices])[:, None]
+    penalty = arrays["flag"][indices].astype(bool)
+    glow = 0.5 + 0.5 * np.sin(arrays["phase"][indices[penalty]])
+    colors[penalty] = np.stack([np.ones_like(glow), glow * 0.3, glow * 0.3], axis=1)
+    return colors
+
+def draw_obstacles(indices, lod):
+    """Draw the obstacles at `indices` (LOD levels `lod`) with one draw call per
+    shape and level: every instance's unit mesh is rotated, scaled and moved on
+    the CPU into one indexed vertex/color array"""
+    obstacles = world.obstacles
+    arrays = obstacles.arrays
+    kinds = arrays["kind"][indices]
+    colors = obstacle_colors(obstacles, indices)
+    for kind, shape in enumerate(Obstacle.SHAPES):
+        axis, scale = OBSTACLE_SHAPES[shape]
+        for level in range(len(LOD_PIXELS) + 1):
+            group = np.flatnonzero((kinds == kind) & (lod == level))
+            if len(group) == 0:
+                continue
+            mesh = obstacle_mesh(shape, level)[0]
+            rows = indices[group]
             
-            if pup.type == 'ammo':
-                game_state["ammo"] += 10
-                print("Ammo +10! Total: " + str(game_state['ammo']))
-            elif pup.type == 'shield':
-                spaceship["shield_active"] = True
-                spaceship["shield_time"] = time.time()
-                print("Shield activated!")
-            elif pup.type == 'health':
-                spaceship["health"] = min(spaceship["health"] + 30, spaceship["max_health"])
-                print("Health +30! Total: " + str(spaceship['health']))
-
-def advance_level():
-    """Advance to next level"""
-    game_state["level"] += 1
-    print("\nLEVEL " + str(game_state['level']) + " REACHED!")
-    print("New obstacles incoming...")
-    spawn_obstacles()
-
-def update_game(dt):
-    """Update all game objects"""
-    if game_state["paused"] or game_state["game_over"]:
+            # (n, 3, 3) model matrices, then every mesh vertex of every instance
+            matrices = (arrays["size"][rows] * scale)[:, None, None] * np.identity(3)
+            if axis is not None:
+                matrices = matrices @ rotation_matrices(axis, arrays["rotation"][rows])
+            vertices, vertex_colors = batch_buffers(len(rows) * len(mesh))
+            instances = vertices.reshape(len(rows), len(mesh), 3)
+            np.matmul(mesh, matrices.transpose(0, 2, 1), out=instances)
+            instances[:, :, 0] += (arrays["x"][rows] - arrays["vx"][rows] * render_lag)[:, None]
+            instances[:, :, 1] += arrays["y"][rows][:, None]
+            instances[:, :, 2] += arrays["z"][rows][:, None]
+            vertex_colors.reshape(len(rows), len(mesh), 3)[:] = colors[group][:, None, :]
+            draw_colored_arrays(GL_TRIANGLES, vertices, vertex_colors,
+                                instance_indices(shape, level, len(rows)))
+    
+    # Health bars above multi-hit obstacles
+    draw_health_bars(indices[arrays["max_health"][indices] > 1])
+
+def draw_health_bars(indices):
+    """Health bars (grey background quad + colored health quad) above the
+    obstacles at `indices`, as one quad array"""
+    if len(indices) == 0:
+        return
+    arrays = world.obstacles.arrays
+    fraction = arrays["health"][indices] / arrays["max_health"][indices]
+    
+    # Quad corners relative to the bar's left end: background, then health
+    corners = np.zeros((len(indices), 8, 3), np.float32)
+    corners[:, :4, 0] = [-15, 15, 15, -15]
+    corners[:, 4:, 0] = -15
+    corners[:, 5:7, 0] += (30 * fraction)[:, None]
+    corners[:, [2, 3, 6, 7], 1] = 3
+    corners[:, :, 0] += (arrays["x"][indices] - arrays["vx"][indices] * render_lag)[:, None]
+    corners[:, :, 1] += (arrays["y"][indices] + arrays["size"][indices] + 10)[:, None]
+    corners[:, :, 2] += arrays["z"][indices][:, None]
+    
+    colors = np.zeros((len(indices), 8, 3), np.float32)
+    colors[:, :4] = 0.2
+    health = np.where(fraction[:, None] > 0.5, [0.0, 1.0, 0.0],
+                      np.where(fraction[:, None] > 0.25, [1.0, 1.0, 0.0], [1.0, 0.0, 0.0]))
+    colors[:, 4:] = health[:, None, :]
+    draw_colored_arrays(GL_QUADS, corners.reshape(-1, 3), colors.reshape(-1, 3))
+
+def draw_projectile_model(trail_spheres=3):
+    """Projectile with its trail, at the origin (compiled once per trail length by call_mesh)"""
+    # Glowing projectile
+    glColor3f(0.0, 1.0, 1.0)
+    solid_sphere(3, 8, 8)
+    
+    # Trail effect
+    glColor4f(0.0, 0.8, 1.0, 0.3)
+    for i in range(1, trail_spheres + 1):
+        glPushMatrix()
+        glTranslatef(-i * 8, 0, 0)
+        solid_sphere(2, 6, 6)
+        glPopMatrix()
+
+def draw_projectile(proj):
+    """Draw one projectile with its trail"""
+    glPushMatrix()
+    glTranslatef(proj.x - proj.vx * render_lag, proj.y, proj.z)
+    draw_projectile_model_cached(quality.settings.trail_spheres)
+    glPopMatrix()
+
+def draw_projectile_model_cached(trail_spheres):
+    """Replay the projectile display list with `trail_spheres` trail spheres"""
+    call_mesh(("projectile", trail_spheres), lambda: draw_projectile_model(trail_spheres))
+
+def draw_powerup(pup):
+    """Draw one power-up"""
+    if pup.collected:
         return
     
-    # Update stars, nebulas, planets
-    for star in stars:
-        star.update(dt)
-    for nebula in nebulas:
-        nebula.update(dt)
-    for planet in planets:
-        planet.update(dt)
-    
-    # Update obstacles
-    for obs in obstacles[:]:
-        obs.update(dt)
-        if obs.x < -WORLD_W/2 - 200:
-            obstacles.remove(obs)
-            # Spawn new obstacle
-            level = game_state["level"]
-            config = LEVEL_CONFIG[level]
-            is_penalty = False
-            if config["spawn_penalty_obstacles"]:
-                is_penalty = random.random() < config["penalty_ratio"]
-            obstacles.append(Obstacle(level=level, is_penalty=is_penalty))
-            
-            # Award survival points
-            game_state["score"] += 1
-    
-    # Update projectiles
-    for proj in projectiles[:]:
-        proj.update(dt)
-        if proj.life <= 0 or proj.x > WORLD_W/2 + 200:
-            projectiles.remove(proj)
-    
-    # Update powerups
-    for pup in powerups[:]:
-        pup.update(dt)
-        if pup.x < -WORLD_W/2 - 200:
-            powerups.remove(pup)
-    
-    # Update particles
-    for particle in particles[:]:
-        particle.update(dt)
-        if particle.life <= 0:
-            particles.remove(particle)
-    
-    # Spawn powerups randomly
-    if random.random() < 0.002:  # Small chance each frame
-        spawn_powerup()
-    
-    # Ammo recharge over time
-    current_time = time.time()
-    if current_time - game_state["last_ammo_recharge"] >= AMMO_RECHARGE_TIME:
-        if game_state["ammo"] < INITIAL_AMMO:
-            game_state["ammo"] += 1
-        game_state["last_ammo_recharge"] = current_time
-    
-    # Shield duration check (NEW FEATURE 2: Temporary shield)
-    if spaceship["shield_active"]:
-        if time.time() - spaceship["shield_time"] > 5.0:  # 5 second shield
-            spaceship["shield_active"] = False
-            print("Shield deactivated")
+    glPushMatrix()
+    glTranslatef(pup.x - pup.vx * render_lag, pup.y + math.sin(pup.bob_offset) * 5, pup.z)
+    glRotatef(pup.rotation, 0, 1, 0)
+    
+    if pup.type == 'ammo':
+        glColor3f(1.0, 1.0, 0.0)  # Yellow
+        solid_cube(pup.size)
+    elif pup.type == 'shield':
+        glColor3f(0.0, 0.5, 1.0)  # Blue
+        solid_sphere(pup.size/2, 12, 12)
+    elif pup.type == 'health':
+        glColor3f(0.0, 1.0, 0.0)  # Green
+        solid_torus(pup.size/4, pup.size/2, 8, 12)
     
-    # Check collisions
-    check_collisions()
+    glPopMatrix()
 
-# =========================
-# DRAWING FUNCTIONS
-# =========================
+def draw_particles():
+    """Draw every explosion particle in one batched point-sprite call"""
+    global particle_positions
+    pool = world.particles
+    
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glDepthMask(GL_FALSE)  # Faded/dead particles must not hide what's behind them
+    glEnable(GL_POINT_SMOOTH)
+    
+    # Points shrink with distance like the old spheres did
+    glPointSize(PARTICLE_POINT_SIZE)
+    glPointParameterfv(GL_POINT_DISTANCE_ATTENUATION, PARTICLE_ATTENUATION)
+    
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    if len(particle_positions) != pool.capacity:
+        particle_positions = np.zeros((pool.capacity, 3), np.float32)
+    np.multiply(pool.velocity, -render_lag, out=particle_positions)
+    particle_positions += pool.position
+    # Lower quality draws every n-th slot: explosions fill consecutive slots,
+    # so each one keeps an even share of its particles
+    stride = quality.settings.particle_stride
+    glVertexPointer(3, GL_FLOAT, 12 * stride, particle_positions)
+    glColorPointer(4, GL_FLOAT, 16 * stride, pool.color)
+    glDrawArrays(GL_POINTS, 0, (pool.capacity + stride - 1) // stride)
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+    
+    glPointParameterfv(GL_POINT_DISTANCE_ATTENUATION, [1.0, 0.0, 0.0])
+    glDisable(GL_POINT_SMOOTH)
+    glDepthMask(GL_TRUE)
+    glDisable(GL_BLEND)
 
 def draw_gradient_background():
     """Draw gradient background based on level"""
@@ -649,54 +455,86 @@ def draw_gradient_background():
     glMatrixMode(GL_MODELVIEW)
 
 def draw_stars():
-    """Draw twinkling stars"""
+    """Draw twinkling stars as one vertex/color array"""
+    store = world.stars
+    count = int(len(store) * quality.settings.star_fraction)  # Stars are in random order
+    if count == 0:
+        return
+    
+    if len(star_batch["vertices"]) < count:
+        star_batch["vertices"] = np.zeros((count, 3), np.float32)
+        star_batch["colors"] = np.zeros((count, 3), np.float32)
+        star_batch["twinkle"] = np.zeros(count, np.float64)
+    vertices = star_batch["vertices"][:count]
+    colors = star_batch["colors"][:count]
+    twinkle = star_batch["twinkle"][:count]
+    
+    vertices[:, 0] = store.column("x")[:count]
+    vertices[:, 1] = store.column("y")[:count]
+    vertices[:, 2] = store.column("z")[:count]
+    
+    # brightness * (0.5 + 0.5 * sin(t * speed + offset)) for every star at once
+    np.multiply(store.column("twinkle_speed")[:count], time.time(), out=twinkle)
+    twinkle += store.column("twinkle_offset")[:count]
+    np.sin(twinkle, out=twinkle)
+    twinkle *= 0.5
+    twinkle += 0.5
+    twinkle *= store.column("brightness")[:count]
+    colors[:, 0] = twinkle
+    colors[:, 1] = twinkle
+    colors[:, 2] = twinkle
+    
     glPointSize(2.0)
-    for star in stars:
-        twinkle = 0.5 + 0.5 * math.sin(time.time() * star.twinkle_speed + star.twinkle_offset)
-        brightness = star.brightness * twinkle
-        glColor3f(brightness, brightness, brightness)
-        glBegin(GL_POINTS)
-        glVertex3f(star.x, star.y, star.z)
-        glEnd()
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, vertices)
+    glColorPointer(3, GL_FLOAT, 0, colors)
+    glDrawArrays(GL_POINTS, 0, count)
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
 
 def draw_nebulas():
     """Draw nebula clouds"""
     glEnable(GL_BLEND)
     glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
     
-    for nebula in nebulas:
+    nebulas = world.nebulas
+    visible, lod = visible_bodies(nebulas, nebulas.column("size"), interpolate=False)
+    nebula_count = quality.settings.nebula_count
+    if nebula_count is not None:
+        keep = visible < nebula_count
+        visible, lod = visible[keep], lod[keep]
+    for i, level in zip(visible, lod):
+        nebula = nebulas[i]
         glPushMatrix()
         glTranslatef(nebula.x, nebula.y, nebula.z)
         glRotatef(nebula.rotation, 0, 0, 1)
         glColor4f(nebula.color[0], nebula.color[1], nebula.color[2], 0.3)
-        glutSolidSphere(nebula.size, 20, 20)
+        solid_sphere(nebula.size, lod_segments(20, level), lod_segments(20, level))
         glPopMatrix()
     
     glDisable(GL_BLEND)
 
 def draw_planets():
     """Draw planets"""
-    for planet in planets:
+    planets = world.planets
+    visible, lod = visible_bodies(planets, planets.column("size"), interpolate=False)
+    for i, level in zip(visible, lod):
+        planet = planets[i]
         glPushMatrix()
         glTranslatef(planet.x, planet.y, planet.z)
         glRotatef(planet.rotation, 0, 1, 0)
         glColor3f(*planet.color)
-        glutSolidSphere(planet.size, 25, 25)
+        solid_sphere(planet.size, lod_segments(25, level), lod_segments(25, level))
         glPopMatrix()
 
-def draw_spaceship():
-    """Draw the player's spaceship with new design"""
-    x, y, z = spaceship["x"], spaceship["y"], spaceship["z"]
-    
-    glPushMatrix()
-    glTranslatef(x, y, z)
-    glRotatef(spaceship["rotation"], 0, 1, 0)
-    
+def draw_spaceship_model():
+    """Spaceship hull, cockpit, wings and engine at the origin (compiled once by call_mesh)"""
     # Main hull (elongated diamond shape)
     glColor3f(0.8, 0.8, 0.9)
     glPushMatrix()
     glScalef(3, 1, 1)
-    glutSolidSphere(15, 20, 20)
+    solid_sphere(15, 20, 20)
     glPopMatrix()
     
     # Cockpit
@@ -704,7 +542,7 @@ def draw_spaceship():
     glPushMatrix()
     glTranslatef(30, 8, 0)
     glScalef(1.5, 0.8, 0.8)
-    glutSolidSphere(10, 15, 15)
+    solid_sphere(10, 15, 15)
     glPopMatrix()
     
     # Wings
@@ -714,7 +552,7 @@ def draw_spaceship():
     glTranslatef(0, 15, 0)
     glRotatef(45, 1, 0, 0)
     glScalef(1.5, 0.2, 2)
-    glutSolidCube(12)
+    solid_cube(12)
     glPopMatrix()
     
     # Bottom wing
@@ -722,15 +560,25 @@ def draw_spaceship():
     glTranslatef(0, -15, 0)
     glRotatef(-45, 1, 0, 0)
     glScalef(1.5, 0.2, 2)
-    glutSolidCube(12)
+    solid_cube(12)
     glPopMatrix()
     
     # Engine glow
     glColor3f(0.0, 0.8, 1.0)
     glPushMatrix()
     glTranslatef(-35, 0, 0)
-    glutSolidSphere(5, 12, 12)
+    solid_sphere(5, 12, 12)
     glPopMatrix()
+
+def draw_spaceship():
+    """Draw the player's spaceship with new design"""
+    x, y, z = spaceship["x"], spaceship["y"], spaceship["z"]
+    
+    glPushMatrix()
+    glTranslatef(x, y, z)
+    glRotatef(spaceship["rotation"], 0, 1, 0)
+    
+    call_mesh(("spaceship",), draw_spaceship_model)
     
     # Shield effect if active
     if spaceship["shield_active"]:
@@ -738,7 +586,8 @@ def draw_spaceship():
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         pulse = 0.5 + 0.3 * math.sin(time.time() * 5)
         glColor4f(0.0, 0.5, 1.0, pulse)
-        glutSolidSphere(35, 25, 25)
+        segments = lod_segments(25, quality.settings.detail)
+        solid_sphere(35, segments, segments)
         glDisable(GL_BLEND)
     
     glPopMatrix()
@@ -756,19 +605,19 @@ def draw_hud():
     
     # Score
     glColor3f(1, 1, 1)
-    draw_text(20, WINDOW_H - 30, f"SCORE: {game_state['score']}", GLUT_BITMAP_HELVETICA_18)
+    draw_text(20, WINDOW_H - 30, f"SCORE: {game_state['score']}", GLUT_BITMAP_HELVETICA_18, "score")
     
     # Level
     glColor3f(1, 1, 0)
-    draw_text(20, WINDOW_H - 60, f"LEVEL: {game_state['level']}", GLUT_BITMAP_HELVETICA_18)
+    draw_text(20, WINDOW_H - 60, f"LEVEL: {game_state['level']}", GLUT_BITMAP_HELVETICA_18, "level")
     
     # Lives
     glColor3f(1, 0.3, 0.3)
-    draw_text(20, WINDOW_H - 90, f"LIVES: {game_state['lives']}", GLUT_BITMAP_HELVETICA_18)
+    draw_text(20, WINDOW_H - 90, f"LIVES: {game_state['lives']}", GLUT_BITMAP_HELVETICA_18, "lives")
     
     # Ammo
     glColor3f(0, 1, 1)
-    draw_text(20, WINDOW_H - 120, f"AMMO: {game_state['ammo']}", GLUT_BITMAP_HELVETICA_18)
+    draw_text(20, WINDOW_H - 120, f"AMMO: {game_state['ammo']}", GLUT_BITMAP_HELVETICA_18, "ammo")
     
     # Health bar
     bar_width = 200
@@ -800,7 +649,7 @@ def draw_hud():
     glEnd()
     
     glColor3f(1, 1, 1)
-    draw_text(25, 35, f"HEALTH: {int(spaceship['health'])}/{spaceship['max_health']}", GLUT_BITMAP_9_BY_15)
+    draw_text(25, 35, f"HEALTH: {int(spaceship['health'])}/{spaceship['max_health']}", GLUT_BITMAP_9_BY_15, "health")
     
     # Instructions toggle hint
     glColor3f(0.7, 0.7, 0.7)
@@ -811,12 +660,33 @@ def draw_hud():
     glPopMatrix()
     glMatrixMode(GL_MODELVIEW)
 
-def draw_text(x, y, text, font):
-    """Helper to draw text"""
-    glRasterPos2f(x, y)
+def draw_bitmap_string(text, font):
+    """One glutBitmapCharacter per character from the current raster position"""
+    if offscreen:
+        return  # GLUT's bitmap fonts need glutInit
     for char in text:
         glutBitmapCharacter(font, ord(char))
 
+def draw_text(x, y, text, font, field=None):
+    """Helper to draw text. Strings are compiled into display lists: fixed text
+    once per (text, font), while a `field` (a HUD value that changes) keeps one
+    list that is only recompiled when its text differs from last time."""
+    glRasterPos2f(x, y)
+    if field is None:
+        # GLUT fonts are unhashable ctypes handles, but each is one module-level object
+        call_mesh(("text", text, id(font)), lambda: draw_bitmap_string(text, font))
+        return
+    
+    cached_text, list_id = text_fields.get(field, (None, None))
+    if cached_text != text:
+        if list_id is None:
+            list_id = glGenLists(1)
+        glNewList(list_id, GL_COMPILE)
+        draw_bitmap_string(text, font)
+        glEndList()
+        text_fields[field] = (text, list_id)
+    glCallList(list_id)
+
 def draw_instructions():
     """Draw instruction overlay"""
     glMatrixMode(GL_PROJECTION)
@@ -828,6 +698,16 @@ def draw_instructions():
     glPushMatrix()
     glLoadIdentity()
     
+    # The panel never changes: one display list for all of it
+    call_mesh(("instructions",), draw_instructions_panel)
+    
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+
+def draw_instructions_panel():
+    """Background, title and help text of the instruction overlay"""
     # Semi-transparent background
     glEnable(GL_BLEND)
     glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
@@ -854,6 +734,7 @@ def draw_instructions():
         "C - Toggle camera (Third/First person)",
         "P - Pause game",
         "H - Toggle this help screen",
+        "F - Toggle frame profiler",
         "Q/ESC - Quit game",
         "",
         "OBSTACLES:",
@@ -877,11 +758,6 @@ def draw_instructions():
     
     glColor3f(1, 1, 0)
     draw_text(WINDOW_W//2 - 80, 180, "Press H to close", GLUT_BITMAP_HELVETICA_18)
-    
-    glPopMatrix()
-    glMatrixMode(GL_PROJECTION)
-    glPopMatrix()
-    glMatrixMode(GL_MODELVIEW)
 
 def draw_start_screen():
     """Draw start screen"""
@@ -896,6 +772,22 @@ def draw_start_screen():
     glPushMatrix()
     glLoadIdentity()
     
+    call_mesh(("start screen",), draw_start_screen_panel)
+    
+    # Start prompt
+    glow = 0.5 + 0.5 * math.sin(time.time() * 3)
+    glColor3f(glow, glow, 0)
+    draw_text(WINDOW_W//2 - 120, WINDOW_H//2 - 180, "Click anywhere to start", GLUT_BITMAP_HELVETICA_18)
+    
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+    
+    swap_buffers()
+
+def draw_start_screen_panel():
+    """Static part of the start screen: background, title and blurb"""
     # Background
     glBegin(GL_QUADS)
     glColor3f(0.05, 0.05, 0.2)
@@ -919,21 +811,8 @@ def draw_start_screen():
     draw_text(WINDOW_W//2 - 200, WINDOW_H//2 - 80, "Shoot normal obstacles, avoid RED ones!", GLUT_BITMAP_HELVETICA_12)
     draw_text(WINDOW_W//2 - 180, WINDOW_H//2 - 110, "Collect power-ups to survive longer", GLUT_BITMAP_HELVETICA_12)
     
-    # Start prompt
-    glColor3f(1, 1, 0)
-    glow = 0.5 + 0.5 * math.sin(time.time() * 3)
-    glColor3f(glow, glow, 0)
-    draw_text(WINDOW_W//2 - 120, WINDOW_H//2 - 180, "Click anywhere to start", GLUT_BITMAP_HELVETICA_18)
-    
     glColor3f(0.6, 0.6, 0.6)
     draw_text(WINDOW_W//2 - 100, 50, "Press H in-game for controls", GLUT_BITMAP_HELVETICA_12)
-    
-    glPopMatrix()
-    glMatrixMode(GL_PROJECTION)
-    glPopMatrix()
-    glMatrixMode(GL_MODELVIEW)
-    
-    glutSwapBuffers()
 
 def draw_game_over_screen():
     """Draw game over screen"""
@@ -948,27 +827,14 @@ def draw_game_over_screen():
     glPushMatrix()
     glLoadIdentity()
     
-    # Background
-    glBegin(GL_QUADS)
-    glColor3f(0.1, 0.0, 0.0)
-    glVertex2f(0, 0)
-    glVertex2f(WINDOW_W, 0)
-    glColor3f(0.0, 0.0, 0.0)
-    glVertex2f(WINDOW_W, WINDOW_H)
-    glVertex2f(0, WINDOW_H)
-    glEnd()
-    
-    # Game Over text
-    glColor3f(1, 0, 0)
-    draw_text(WINDOW_W//2 - 100, WINDOW_H//2 + 80, "GAME OVER", GLUT_BITMAP_TIMES_ROMAN_24)
+    call_mesh(("game over screen",), draw_game_over_panel)
     
     # Stats
     glColor3f(1, 1, 1)
-    draw_text(WINDOW_W//2 - 80, WINDOW_H//2 + 20, f"Final Score: {game_state['score']}", GLUT_BITMAP_HELVETICA_18)
-    draw_text(WINDOW_W//2 - 80, WINDOW_H//2 - 20, f"Level Reached: {game_state['level']}", GLUT_BITMAP_HELVETICA_18)
+    draw_text(WINDOW_W//2 - 80, WINDOW_H//2 + 20, f"Final Score: {game_state['score']}", GLUT_BITMAP_HELVETICA_18, "final score")
+    draw_text(WINDOW_W//2 - 80, WINDOW_H//2 - 20, f"Level Reached: {game_state['level']}", GLUT_BITMAP_HELVETICA_18, "final level")
     
     # Restart prompt
-    glColor3f(1, 1, 0)
     glow = 0.5 + 0.5 * math.sin(time.time() * 3)
     glColor3f(glow, glow, 0)
     draw_text(WINDOW_W//2 - 120, WINDOW_H//2 - 80, "Click to restart", GLUT_BITMAP_HELVETICA_18)
@@ -978,31 +844,44 @@ def draw_game_over_screen():
     glPopMatrix()
     glMatrixMode(GL_MODELVIEW)
     
-    glutSwapBuffers()
+    swap_buffers()
+
+def draw_game_over_panel():
+    """Static part of the game over screen"""
+    # Background
+    glBegin(GL_QUADS)
+    glColor3f(0.1, 0.0, 0.0)
+    glVertex2f(0, 0)
+    glVertex2f(WINDOW_W, 0)
+    glColor3f(0.0, 0.0, 0.0)
+    glVertex2f(WINDOW_W, WINDOW_H)
+    glVertex2f(0, WINDOW_H)
+    glEnd()
+    
+    # Game Over text
+    glColor3f(1, 0, 0)
+    draw_text(WINDOW_W//2 - 100, WINDOW_H//2 + 80, "GAME OVER", GLUT_BITMAP_TIMES_ROMAN_24)
 
 def set_camera():
-    """Set camera based on mode"""
+    """Set camera based on mode (and the Camera used for culling and LOD)"""
+    global camera
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
-    gluPerspective(60.0, WINDOW_W / WINDOW_H, 1.0, 2000.0)
+    gluPerspective(FOVY, WINDOW_W / WINDOW_H, NEAR, FAR)
     
     glMatrixMode(GL_MODELVIEW)
     glLoadIdentity()
     
     if game_state["camera_mode"] == "first_person":
         # First person: camera slightly in front to show front of spacecraft
-        gluLookAt(
-            spaceship["x"] + 30, spaceship["y"] + 20, spaceship["z"],  # Camera in front and above
-            spaceship["x"] + 150, spaceship["y"], spaceship["z"],      # Looking forward
-            0, 1, 0
-        )
+        eye = (spaceship["x"] + 30, spaceship["y"] + 20, spaceship["z"])  # Camera in front and above
+        center = (spaceship["x"] + 150, spaceship["y"], spaceship["z"])   # Looking forward
     else:
         # Third person: camera behind and above ship
-        gluLookAt(
-            spaceship["x"] - 200, spaceship["y"] + 100, spaceship["z"] + 300,
-            spaceship["x"], spaceship["y"], spaceship["z"],
-            0, 1, 0
-        )
+        eye = (spaceship["x"] - 200, spaceship["y"] + 100, spaceship["z"] + 300)
+        center = (spaceship["x"], spaceship["y"], spaceship["z"])
+    gluLookAt(*eye, *center, 0, 1, 0)
+    camera = Camera(FOVY, WINDOW_W / WINDOW_H, NEAR, FAR, eye, center, (0, 1, 0), WINDOW_H)
 
 # =========================
 # GLUT CALLBACKS
@@ -1010,53 +889,90 @@ def set_camera():
 
 def display():
     """Main display function"""
+    global render_lag
+    if simulation_thread is not None:
+        use_world(simulation_thread.latest())
+        if startup_profile and not game_state["in_start_screen"]:
+            # The click's scene build ran on the simulation thread; it ends
+            # with the first published frame past the start screen
+            mark_startup("start game")
+    render_lag = (1.0 - world.alpha) * FIXED_DT
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
     
     if game_state["in_start_screen"]:
         draw_start_screen()
+        if startup_profile:
+            mark_startup("first frame (start screen)")
         return
     
     if game_state["game_over"]:
         draw_game_over_screen()
         return
     
-    # Draw game
-    draw_gradient_background()
+    profiler = world.profiler
+    
+    # Draw game (the background never writes depth, even on the first frame
+    # after init_gl, which a single offscreen capture always is)
+    glDisable(GL_DEPTH_TEST)
+    with profiler.span("draw background"):
+        draw_gradient_background()
     set_camera()
     
     # Enable depth testing
     glEnable(GL_DEPTH_TEST)
     
-    # Draw scene
-    draw_stars()
-    draw_nebulas()
-    draw_planets()
-    
-    # Draw obstacles
-    for obs in obstacles:
-        obs.draw()
-    
-    # Draw projectiles
-    for proj in projectiles:
-        proj.draw()
-    
-    # Draw power-ups
-    for pup in powerups:
-        pup.draw()
+    # Draw scene (the background is placed for the moment being drawn)
+    with profiler.span("place background"):
+        world.place_background(game_state["sim_time"] - render_lag)
+    with profiler.span("draw stars"):
+        draw_stars()
+    with profiler.span("draw nebulas"):
+        draw_nebulas()
+    with profiler.span("draw planets"):
+        draw_planets()
+    
+    # Draw obstacles (bounding radius covers every shape and the health bar)
+    with profiler.span("draw obstacles"):
+        obstacles = world.obstacles
+        visible, lod = visible_bodies(obstacles, obstacles.column("size") + 20)
+        draw_obstacles(visible, lod)
+    
+    # Draw projectiles (with their trails) and power-ups
+    with profiler.span("draw projectiles"):
+        for i in visible_bodies(world.projectiles, 30.0)[0]:
+            draw_projectile(world.projectiles[i])
+        for i in visible_bodies(world.powerups, 20.0)[0]:
+            draw_powerup(world.powerups[i])
     
     # Draw particles
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-    for particle in particles:
-        particle.draw()
-    glDisable(GL_BLEND)
+    with profiler.span("draw particles"):
+        draw_particles()
     
     # Draw spaceship (in third person mode, or partially visible in first person)
-    draw_spaceship()
+    with profiler.span("draw ship"):
+        draw_spaceship()
     
     glDisable(GL_DEPTH_TEST)
     
     # Draw HUD
+    with profiler.span("draw hud"):
+        draw_overlays()
+    
+    if show_profiler:
+        draw_profiler_overlay()
+    
+    with profiler.span("swap"):
+        swap_buffers()
+    profiler.end_frame()
+    if not offscreen:
+        quality.frame(time.perf_counter())
+    
+    if startup_profile:
+        mark_startup("first gameplay frame")
+        report_startup()
+
+def draw_overlays():
+    """HUD, help screen and pause overlay"""
     draw_hud()
     
     # Draw instructions if toggled
@@ -1092,11 +1008,71 @@ def display():
         glMatrixMode(GL_PROJECTION)
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
+
+def draw_profiler_overlay():
+    """Rolling per-phase milliseconds and FPS in the top-right corner"""
+    profiler = world.profiler
+    phases = profiler.averages()
+    frame_ms = 1000.0 / profiler.fps() if profiler.fps() > 0 else 0.0
+    
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    glOrtho(0, WINDOW_W, 0, WINDOW_H, -1, 1)
+    
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+    
+    left = WINDOW_W - PROFILER_PANEL_W - 10
+    top = WINDOW_H - 10
+    bottom = top - 56 - 16 * len(phases)
+    
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glColor4f(0, 0, 0, 0.6)
+    glBegin(GL_QUADS)
+    glVertex2f(left, bottom)
+    glVertex2f(left + PROFILER_PANEL_W, bottom)
+    glVertex2f(left + PROFILER_PANEL_W, top)
+    glVertex2f(left, top)
+    glEnd()
+    glDisable(GL_BLEND)
+    
+    glColor3f(0, 1, 0)
+    draw_text(left + 10, top - 20, f"FPS: {profiler.fps():.1f}  ({frame_ms:.2f} ms)", GLUT_BITMAP_9_BY_15, "profiler fps")
+    
+    mode = "auto" if quality.adaptive else "fixed"
+    draw_text(left + 10, top - 36, f"Quality: {quality.level}/{len(QUALITY_LEVELS) - 1} ({mode})",
+              GLUT_BITMAP_9_BY_15, "profiler quality")
     
-    glutSwapBuffers()
+    glColor3f(1, 1, 1)
+    y_pos = top - 56
+    for name, ms in phases:
+        draw_text(left + 10, y_pos, f"{name:<18}{ms:7.3f} ms", GLUT_BITMAP_9_BY_15, "profiler " + name)
+        y_pos -= 16
+    
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+
+def toggle_profiler():
+    """Show/hide the profiler overlay; timing stays on while a trace is being kept"""
+    global show_profiler
+    show_profiler = not show_profiler
+    world.profiler.enabled = show_profiler or world.profiler.trace is not None
 
 def idle():
     """Idle callback for animation"""
+    if simulation_thread is not None:
+        glutPostRedisplay()  # The simulation runs on its own thread
+        return
+    
+    if replay_player is not None:
+        replay_idle()
+        return
+    
     if game_state["paused"] or game_state["in_start_screen"] or game_state["game_over"]:
         glutPostRedisplay()
         return
@@ -1105,89 +1081,90 @@ def idle():
     if game_state["last_time"] == 0:
         game_state["last_time"] = now
     
-    dt = now - game_state["last_time"]
+    frame_time = now - game_state["last_time"]
     game_state["last_time"] = now
     
-    # Cap dt to prevent large jumps
-    dt = min(dt, 0.1)
+    # Run whole simulation ticks for the elapsed real time
+    with world.profiler.span("simulate"):
+        world.advance(frame_time)
+    glutPostRedisplay()
+
+def replay_idle():
+    """Idle callback while watching a replay: recorded input drives the world"""
+    now = time.time()
+    if game_state["last_time"] == 0:
+        game_state["last_time"] = now
+    frame_time = now - game_state["last_time"]
+    game_state["last_time"] = now
     
-    update_game(dt)
+    if not replay_player.done:
+        with world.profiler.span("simulate"):
+            world.advance(frame_time)
+        if replay_player.done and replay_player.divergence is not None:
+            tick, reason = replay_player.divergence
+            print("Replay diverged at tick " + str(tick) + ": " + reason)
     glutPostRedisplay()
 
+def send_action(action):
+    """Apply a player action now, or queue it for the simulation thread's next tick"""
+    if simulation_thread is not None:
+        simulation_thread.post(action)
+    else:
+        world.apply_action(action)
+
 def keyboard(key, x, y):
     """Keyboard input"""
+    if replay_player is not None and key not in [b'q', b'Q', b'\x1b', b'f', b'F']:
+        return
+    
     if key == b' ':
-        shoot_projectile()
+        send_action("shoot")
     elif key in [b'c', b'C']:
-        # Toggle camera
-        if game_state["camera_mode"] == "third_person":
-            game_state["camera_mode"] = "first_person"
-            print("First-person camera")
-        else:
-            game_state["camera_mode"] = "third_person"
-            print("Third-person camera")
+        send_action("camera")
     elif key in [b'p', b'P']:
-        # Toggle pause
-        game_state["paused"] = not game_state["paused"]
-        if game_state["paused"]:
-            print("Paused")
-        else:
-            print("Resumed")
+        send_action("pause")
+        if not game_state["paused"]:
             game_state["last_time"] = time.time()
     elif key in [b'h', b'H']:
-        # Toggle instructions
-        game_state["show_instructions"] = not game_state["show_instructions"]
+        send_action("help")
+    elif key in [b'f', b'F']:
+        toggle_profiler()
     elif key in [b'q', b'Q', b'\x1b']:
         # Quit
         print("Thanks for playing!")
         sys.exit()
 
+# Arrow keys -> ship movement actions
+SPECIAL_KEY_ACTIONS = {
+    GLUT_KEY_UP: "up",
+    GLUT_KEY_DOWN: "down",
+    GLUT_KEY_LEFT: "left",
+    GLUT_KEY_RIGHT: "right"
+}
+
 def special_keys(key, x, y):
     """Special key input (arrow keys)"""
-    if game_state["paused"] or game_state["game_over"]:
-        return
-    
-    move_speed = 15
-    
-    if key == GLUT_KEY_UP:
-        spaceship["y"] += move_speed
-        spaceship["y"] = min(spaceship["y"], WORLD_H/2 - 50)
-    elif key == GLUT_KEY_DOWN:
-        spaceship["y"] -= move_speed
-        spaceship["y"] = max(spaceship["y"], -WORLD_H/2 + 50)
-    elif key == GLUT_KEY_LEFT:
-        # Add left movement with less restricted threshold
-        spaceship["z"] -= move_speed
-        spaceship["z"] = max(spaceship["z"], -170)  # Expanded to -250
-    elif key == GLUT_KEY_RIGHT:
-        # Add right movement with less restricted threshold
-        spaceship["z"] += move_speed
-        spaceship["z"] = min(spaceship["z"], 170)  # Expanded to +250
+    if replay_player is None and key in SPECIAL_KEY_ACTIONS:
+        send_action(SPECIAL_KEY_ACTIONS[key])
 
 def mouse(button, state, x, y):
     """Mouse input"""
+    if replay_player is not None:
+        return
+    
     if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
-        if game_state["in_start_screen"]:
-            game_state["in_start_screen"] = False
-            game_state["last_time"] = time.time()
-            game_state["last_ammo_recharge"] = time.time()
-            initialize_scene()
-            print("\nGame started!")
-        elif game_state["game_over"]:
-            # Restart game
-            game_state["game_over"] = False
-            game_state["score"] = 0
-            game_state["lives"] = INITIAL_LIVES
-            game_state["ammo"] = INITIAL_AMMO
-            game_state["level"] = 1
-            spaceship["health"] = spaceship["max_health"]
-            spaceship["x"] = -200.0
-            spaceship["y"] = 0.0
-            spaceship["shield_active"] = False
+        if game_state["in_start_screen"] or game_state["game_over"]:
+            if startup_profile:
+                mark_startup("waiting for click")
+            send_action("click")
+            if startup_profile and simulation_thread is None:
+                mark_startup("start game")
             game_state["last_time"] = time.time()
-            game_state["last_ammo_recharge"] = time.time()
-            initialize_scene()
-            print("\nGame restarted!")
+
+def swap_buffers():
+    """Show the finished frame (offscreen frames stay in the back buffer to be read)"""
+    if not offscreen:
+        glutSwapBuffers()
 
 def reshape(w, h):
     """Window reshape callback"""
@@ -1199,19 +1176,98 @@ def init_gl():
     glEnable(GL_DEPTH_TEST)
     glShadeModel(GL_SMOOTH)
     glEnable(GL_COLOR_MATERIAL)
+    warm_mesh_cache()
 
 # =========================
 # MAIN
 # =========================
 
-def main():
-    """Main entry point"""
+def use_world(new_world):
+    """Point the renderer (and its game_state/spaceship aliases) at another
+    World, or at a sim_thread.RenderFrame of one"""
+    global world, game_state, spaceship
+    world = new_world
+    game_state = world.game_state
+    spaceship = world.spaceship
+
+def save_recording(recorder, path):
+    """Write the recorded session on exit"""
+    recorder.replay.save(path)
+    print("Replay saved to " + path)
+
+def save_trace(profiler, path):
+    """Write the profiler's Chrome trace on exit"""
+    count = profiler.save_trace(path)
+    print("Trace (" + str(count) + " spans) saved to " + path)
+
+def mark_startup(phase):
+    """End the current --startup-profile phase (each phase is kept once)"""
+    if all(name != phase for name, _ in startup_marks):
+        startup_marks.append((phase, time.perf_counter()))
+
+def report_startup():
+    """Print the startup phases and stop profiling"""
+    global startup_profile
+    startup_profile = False
+    marks = dict(startup_marks)
+    start = marks["start"]
+    print("\nStartup profile (ms):")
+    for (_, begin), (phase, end) in zip(startup_marks, startup_marks[1:]):
+        print("  " + phase.ljust(28) + ("%9.1f" % ((end - begin) * 1000.0)))
+    if "first frame (start screen)" in marks:
+        print("  time to first window".ljust(30) +
+              ("%9.1f" % ((marks["first frame (start screen)"] - start) * 1000.0)))
+    # From the click (or from process start without one, e.g. in a replay)
+    clicked = marks.get("waiting for click", start)
+    print("  time to first gameplay frame".ljust(30) +
+          ("%9.1f" % ((marks["first gameplay frame"] - clicked) * 1000.0)))
+
+def main(player=None):
+    """Main entry point. Pass a replay.Player to watch a recording instead of
+    playing. Command-line flags:
+      --record FILE       record this session for replay.py
+      --trace FILE        save per-phase timings as a Chrome trace (chrome://tracing)
+      --single-thread     step the simulation from the GLUT idle callback
+                          instead of its own thread
+      --events FILE       log gameplay events as JSON lines
+      --quiet             keep gameplay events off the console
+      --startup-profile   time each startup phase up to the first gameplay frame
+      --frame-budget MS   frame time adaptive quality holds (default 16.6)
+      --quality LEVEL     pin one quality level instead"""
+    global replay_player, startup_profile, simulation_thread
+    startup_profile = "--startup-profile" in sys.argv
+    if "--frame-budget" in sys.argv:
+        quality.budget_ms = float(sys.argv[sys.argv.index("--frame-budget") + 1])
+    if "--quality" in sys.argv:
+        quality.adaptive = False
+        quality.set_level(int(sys.argv[sys.argv.index("--quality") + 1]))
+    if player is not None:
+        replay_player = player
+        use_world(player.world)
+    elif "--record" in sys.argv:
+        path = sys.argv[sys.argv.index("--record") + 1]
+        atexit.register(save_recording, Recorder(world), path)
+    
+    # Gameplay events go to the console unless --quiet, and to --events FILE as JSONL
+    # (both written by background threads; close() flushes them at exit)
+    world.events.echo = "--quiet" not in sys.argv
+    if "--events" in sys.argv:
+        world.events.open(sys.argv[sys.argv.index("--events") + 1])
+    atexit.register(world.events.close)
+    
+    if "--trace" in sys.argv:
+        path = sys.argv[sys.argv.index("--trace") + 1]
+        world.profiler.start_trace()
+        atexit.register(save_trace, world.profiler, path)
+    
     glutInit()
     glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
     glutInitWindowSize(WINDOW_W, WINDOW_H)
     glutCreateWindow(b"Cosmic Flight: Space Navigation")
+    mark_startup("glutInit + window")
     
     init_gl()
+    mark_startup("init_gl + mesh cache")
     
     glutDisplayFunc(display)
     glutIdleFunc(idle)
@@ -1220,6 +1276,11 @@ def main():
     glutMouseFunc(mouse)
     glutReshapeFunc(reshape)
     
+    if player is None and "--single-thread" not in sys.argv:
+        simulation_thread = SimulationThread(world)
+        simulation_thread.start()
+        atexit.register(simulation_thread.stop)  # Runs before the recording/trace/events are saved
+    
     print("\n" + "="*50)
     print("COSMIC FLIGHT: SPACE NAVIGATION GAME")
     print("="*50)
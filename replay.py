@@ -0,0 +1,201 @@
+"""Input recording and replay playback for Cosmic Flight.
+
+Record a session while playing:   python radhika1.py --record session.cfr
+Re-run recordings headless:       python replay.py session.cfr [more.cfr ...]
+Watch a recording in the window:  python replay.py --render session.cfr
+"""
+import json
+import struct
+import sys
+import time
+
+from simulation import World, ACTIONS
+
+MAGIC = b"CFRP"
+VERSION = 2  # Bumped whenever the simulation rules change
+HASH_INTERVAL = 60  # Ticks between state-hash checkpoints
+
+HEADER = struct.Struct("<4sHQI")  # magic, version, seed, final tick
+COUNT = struct.Struct("<I")
+EVENT = struct.Struct("<IB")  # tick, action index
+CHECKPOINT = struct.Struct("<I8s")  # tick, World.state_hash()
+
+# =========================
+# REPLAY FILE
+# =========================
+
+class Replay:
+    """A recorded session: seed, level config, input events and state hashes"""
+    def __init__(self, seed, level_config, events=None, checkpoints=None, final_tick=0):
+        self.seed = seed
+        self.level_config = level_config
+        self.events = events if events is not None else []  # [(tick, action index)]
+        self.checkpoints = checkpoints if checkpoints is not None else []  # [(tick, hash)]
+        self.final_tick = final_tick
+
+    def to_bytes(self):
+        """Compact binary encoding"""
+        config = json.dumps(self.level_config, sort_keys=True).encode("utf-8")
+        parts = [HEADER.pack(MAGIC, VERSION, self.seed, self.final_tick),
+                 COUNT.pack(len(config)), config,
+                 COUNT.pack(len(self.events))]
+        parts.extend(EVENT.pack(tick, action) for tick, action in self.events)
+        parts.append(COUNT.pack(len(self.checkpoints)))
+        parts.extend(CHECKPOINT.pack(tick, digest) for tick, digest in self.checkpoints)
+        return b"".join(parts)
+
+    @staticmethod
+    def from_bytes(data):
+        """Decode a replay written by to_bytes()"""
+        magic, version, seed, final_tick = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a Cosmic Flight replay (version " + str(VERSION) + ")")
+        offset = HEADER.size
+
+        (length,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        config = json.loads(data[offset:offset + length].decode("utf-8"))
+        level_config = {int(level): values for level, values in config.items()}
+        offset += length
+
+        (count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        events = [EVENT.unpack_from(data, offset + i * EVENT.size) for i in range(count)]
+        offset += count * EVENT.size
+
+        (count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        checkpoints = [CHECKPOINT.unpack_from(data, offset + i * CHECKPOINT.size) for i in range(count)]
+
+        return Replay(seed, level_config, events, checkpoints, final_tick)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            return Replay.from_bytes(f.read())
+
+# =========================
+# RECORDING
+# =========================
+
+class Recorder:
+    """World observer that records every action and periodic state hashes"""
+    def __init__(self, world):
+        self.replay = Replay(world.seed, world.level_config)
+        world.observer = self
+
+    def on_action(self, world, action):
+        self.replay.events.append((world.game_state["tick"], ACTIONS.index(action)))
+
+    def on_tick(self, world):
+        tick = world.game_state["tick"]
+        self.replay.final_tick = tick
+        if tick % HASH_INTERVAL == 0:
+            self.replay.checkpoints.append((tick, world.state_hash()))
+
+# =========================
+# PLAYBACK
+# =========================
+
+class Player:
+    """Re-drives a fresh World from a Replay and checks its state hashes.
+    Actions recorded at tick T are applied just before tick T + 1 runs,
+    exactly where the live game applied them."""
+    def __init__(self, replay):
+        self.replay = replay
+        self.world = World(replay.seed, level_config=replay.level_config)
+        self.world.input_source = self.feed
+        self.world.observer = self
+        self.next_event = 0
+        self.expected = dict(replay.checkpoints)
+        self.checked = 0
+        self.divergence = None  # (tick, reason) of the first mismatch
+
+    def feed(self, world):
+        """input_source hook: apply every event recorded for the current tick"""
+        events = self.replay.events
+        tick = world.game_state["tick"]
+        while self.next_event < len(events) and events[self.next_event][0] <= tick:
+            event_tick, action = events[self.next_event]
+            if event_tick < tick and self.divergence is None:
+                self.divergence = (tick, "missed input recorded for tick " + str(event_tick))
+            self.next_event += 1
+            world.apply_action(ACTIONS[action])
+
+    def on_action(self, world, action):
+        pass
+
+    def on_tick(self, world):
+        tick = world.game_state["tick"]
+        if tick in self.expected:
+            self.checked += 1
+            if world.state_hash() != self.expected[tick] and self.divergence is None:
+                self.divergence = (tick, "state hash mismatch")
+
+    @property
+    def done(self):
+        """True once the recorded number of ticks has been simulated"""
+        return self.world.game_state["tick"] >= self.replay.final_tick
+
+    def run_headless(self):
+        """Play the whole replay as fast as possible; returns ticks simulated"""
+        game_state = self.world.game_state
+        while not self.done:
+            before = game_state["tick"]
+            self.world.step()
+            if game_state["tick"] == before:
+                # Paused/over/on the start screen with no recorded input to resume
+                self.divergence = self.divergence or (before, "simulation stalled")
+                break
+        self.feed(self.world)  # Trailing inputs after the last tick
+        return game_state["tick"]
+
+def play_corpus(paths):
+    """Run every replay headless; prints a report and returns the failure count"""
+    failures = 0
+    total_ticks = 0
+    start = time.perf_counter()
+    for path in paths:
+        player = Player(Replay.load(path))
+        total_ticks += player.run_headless()
+        if player.divergence is not None:
+            failures += 1
+            tick, reason = player.divergence
+            print("DIVERGED " + path + " at tick " + str(tick) + ": " + reason)
+        else:
+            print("ok       " + path + " (" + str(player.checked) + " checkpoints)")
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "="*50)
+    print(str(len(paths)) + " replays, " + str(failures) + " diverged")
+    print("Simulated " + str(total_ticks) + " ticks in " + str(round(elapsed, 3)) + "s (" +
+          str(round(total_ticks / max(elapsed, 1e-9))) + " ticks/s)")
+    print("="*50)
+    return failures
+
+# =========================
+# MAIN
+# =========================
+
+def main():
+    """python replay.py [--render] FILE [FILE ...]"""
+    args = sys.argv[1:]
+    render = "--render" in args
+    paths = [arg for arg in args if arg != "--render"]
+    if not paths:
+        print("usage: python replay.py [--render] FILE [FILE ...]")
+        sys.exit(2)
+
+    if render:
+        import radhika1  # Only the windowed mode needs OpenGL
+        player = Player(Replay.load(paths[0]))
+        radhika1.main(player)
+    else:
+        sys.exit(1 if play_corpus(paths) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Authoritative multi-session game server (asyncio, TCP on localhost).
+
+    python server.py [--port 7777] [--tick-hz 60] [--send-every 1]
+    python load_test.py --sessions 200 --duration 20 --spawn-server
+
+Each connection is one session with its own seeded World. Clients only send
+the actions the keyboard/mouse would (simulation.ACTIONS) and draw the state
+they get back. One ticker task steps every session at the fixed tick, then
+sends every client its state, so sessions are batched tick by tick instead
+of each running its own timer.
+
+Messages are framed as <length:u32><type:u8><payload>, little-endian:
+  client -> server  HELLO    seed:u64
+                    INPUT    action index:u8, ...  (applied before the next tick)
+                    METRICS                        (answered with METRICS)
+  server -> client  WELCOME  session id:u32, tick rate:u16
+                    STATE    see encode_state()
+                    METRICS  JSON: per-session tick times and server load
+"""
+import argparse
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+
+import numpy as np
+
+from simulation import World, ACTIONS
+
+PORT = 7777
+TICK_HZ = 60
+MAX_CATCH_UP = 5  # Ticks run back to back when the server falls behind; the rest are dropped
+METRIC_HISTORY = 600  # Tick timings kept per session
+MAX_PENDING_BYTES = 256 * 1024  # Skip state frames for clients that stop reading
+REPORT_INTERVAL = 5.0  # Seconds between load reports on the console
+
+FRAME = struct.Struct("<IB")  # payload length, message type
+HELLO, INPUT, METRICS, WELCOME, STATE = 1, 2, 3, 4, 5
+SEED = struct.Struct("<Q")
+WELCOME_BODY = struct.Struct("<IH")
+
+# STATE: tick, score, lives, ammo, level, health, ship x/y/z, flags, then the
+# obstacle/projectile/power-up counts and their float32/uint8 arrays
+STATE_HEADER = struct.Struct("<IiiiHf3fBHHH")
+FLAG_START_SCREEN, FLAG_GAME_OVER, FLAG_PAUSED, FLAG_SHIELD = 1, 2, 4, 8
+OBSTACLE_COLUMNS = ("x", "y", "z", "size", "rotation", "health", "max_health")
+
+# =========================
+# PROTOCOL
+# =========================
+
+def frame(kind, payload=b""):
+    return FRAME.pack(len(payload), kind) + payload
+
+async def read_frame(reader):
+    """(type, payload) of the next message; raises IncompleteReadError at EOF"""
+    length, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return kind, await reader.readexactly(length)
+
+def encode_state(world):
+    """Everything a thin client draws, as one STATE payload"""
+    game_state = world.game_state
+    spaceship = world.spaceship
+    obstacles, projectiles, powerups = world.obstacles, world.projectiles, world.powerups
+    flags = ((FLAG_START_SCREEN if game_state["in_start_screen"] else 0) |
+             (FLAG_GAME_OVER if game_state["game_over"] else 0) |
+             (FLAG_PAUSED if game_state["paused"] else 0) |
+             (FLAG_SHIELD if spaceship["shield_active"] else 0))
+    parts = [STATE_HEADER.pack(game_state["tick"], game_state["score"], game_state["lives"],
+                               game_state["ammo"], game_state["level"], spaceship["health"],
+                               spaceship["x"], spaceship["y"], spaceship["z"], flags,
+                               len(obstacles), len(projectiles), len(powerups))]
+    parts.extend(obstacles.column(name).tobytes() for name in OBSTACLE_COLUMNS)
+    parts.append(obstacles.column("kind").tobytes())
+    parts.append(obstacles.column("flag").tobytes())
+    parts.extend(array.tobytes() for array in projectiles.positions())
+    parts.extend(array.tobytes() for array in powerups.positions())
+    parts.append(powerups.column("kind").tobytes())
+    return b"".join(parts)
+
+def decode_state(payload):
+    """STATE payload -> dict of scalars and numpy arrays (views into `payload`)"""
+    values = STATE_HEADER.unpack_from(payload, 0)
+    state = dict(zip(("tick", "score", "lives", "ammo", "level", "health"), values[:6]))
+    state["ship"] = values[6:9]
+    state["flags"] = values[9]
+    obstacle_count, projectile_count, powerup_count = values[10:]
+    offset = STATE_HEADER.size
+
+    def take(dtype, count):
+        nonlocal offset
+        array = np.frombuffer(payload, dtype, count, offset)
+        offset += array.nbytes
+        return array
+
+    state["obstacles"] = {name: take(np.float32, obstacle_count) for name in OBSTACLE_COLUMNS}
+    state["obstacles"]["kind"] = take(np.int8, obstacle_count)
+    state["obstacles"]["flag"] = take(np.int8, obstacle_count)
+    state["projectiles"] = [take(np.float32, projectile_count) for _ in range(3)]
+    state["powerups"] = [take(np.float32, powerup_count) for _ in range(3)]
+    state["powerup_kinds"] = take(np.int8, powerup_count)
+    return state
+
+# =========================
+# SESSIONS
+# =========================
+
+class Session:
+    """One client's game: its World, queued inputs and tick timings"""
+    def __init__(self, session_id, seed, writer):
+        self.id = session_id
+        self.writer = writer
+        self.world = World(seed, star_count=0)  # Clients draw their own starfield
+        self.world.input_source = self.apply_inputs
+        self.inputs = deque()  # Action indices received since the last tick
+        self.tick_ms = deque(maxlen=METRIC_HISTORY)
+        self.ticks = 0
+        self.skipped_frames = 0  # STATE frames not sent because the client fell behind
+
+    def apply_inputs(self, world):
+        """World.input_source hook: apply every action received since the last tick"""
+        inputs = self.inputs
+        while inputs:
+            world.apply_action(ACTIONS[inputs.popleft()])
+
+    def tick(self):
+        start = time.perf_counter()
+        self.world.step()
+        self.tick_ms.append((time.perf_counter() - start) * 1000.0)
+        self.ticks += 1
+
+    def send_state(self):
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+            self.skipped_frames += 1
+            return
+        self.writer.write(frame(STATE, encode_state(self.world)))
+
+    def metrics(self):
+        samples = np.fromiter(self.tick_ms, float, len(self.tick_ms))
+        if len(samples) == 0:
+            samples = np.zeros(1)
+        return {"session": self.id, "ticks": self.ticks, "tick": self.world.game_state["tick"],
+                "mean_ms": round(float(samples.mean()), 4),
+                "p99_ms": round(float(np.percentile(samples, 99)), 4),
+                "max_ms": round(float(samples.max()), 4),
+                "skipped_frames": self.skipped_frames}
+
+class GameServer:
+    """Accepts sessions and steps all of them from one fixed-rate ticker"""
+    def __init__(self, tick_hz=TICK_HZ, send_every=1, report=True):
+        self.tick_hz = tick_hz
+        self.send_every = send_every  # Send state every N ticks
+        self.report = report
+        self.sessions = {}
+        self.next_id = 1
+        self.ticks = 0
+        self.dropped_ticks = 0
+        self.busy = deque(maxlen=tick_hz * 5)  # (wall seconds, busy seconds) per ticker pass
+
+    async def handle(self, reader, writer):
+        """One connection: a HELLO starts its session, then inputs until EOF.
+        METRICS may be asked for without a session (monitoring)."""
+        session = None
+        try:
+            while True:
+                kind, payload = await read_frame(reader)
+                if kind == INPUT and session is not None:
+                    session.inputs.extend(action for action in payload if action < len(ACTIONS))
+                elif kind == HELLO and session is None:
+                    (seed,) = SEED.unpack(payload)
+                    session = Session(self.next_id, seed, writer)
+                    self.next_id += 1
+                    self.sessions[session.id] = session
+                    writer.write(frame(WELCOME, WELCOME_BODY.pack(session.id, self.tick_hz)))
+                elif kind == METRICS:
+                    writer.write(frame(METRICS, json.dumps(self.metrics()).encode("utf-8")))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if session is not None:
+                del self.sessions[session.id]
+            writer.close()
+
+    def tick_all(self):
+        """One tick of every session"""
+        for session in list(self.sessions.values()):
+            session.tick()
+        self.ticks += 1
+
+    async def run_ticker(self):
+        period = 1.0 / self.tick_hz
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        last_report = last_pass = next_tick
+        while True:
+            now = loop.time()
+            due = int((now - next_tick) / period) + 1
+            if due > MAX_CATCH_UP:
+                self.dropped_ticks += due - MAX_CATCH_UP
+                next_tick += (due - MAX_CATCH_UP) * period
+                due = MAX_CATCH_UP
+            start = time.perf_counter()
+            for _ in range(due):
+                self.tick_all()
+                if self.ticks % self.send_every == 0:
+                    for session in list(self.sessions.values()):
+                        session.send_state()
+            self.busy.append((now - last_pass, time.perf_counter() - start))
+            last_pass = now
+            next_tick += due * period
+
+            if self.report and now - last_report >= REPORT_INTERVAL:
+                last_report = now
+                print(self.report_line())
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def load(self):
+        """Fraction of wall time spent ticking and sending (recent passes)"""
+        wall = sum(seconds for seconds, _ in self.busy)
+        return sum(busy for _, busy in self.busy) / wall if wall else 0.0
+
+    def metrics(self):
+        load = self.load()
+        sessions = len(self.sessions)
+        return {"sessions": sessions, "tick_hz": self.tick_hz, "ticks": self.ticks,
+                "dropped_ticks": self.dropped_ticks, "load": round(load, 4),
+                "sessions_per_core": round(sessions / load) if load else None,
+                "per_session": [session.metrics() for session in self.sessions.values()]}
+
+    def report_line(self):
+        load = self.load()
+        sessions = len(self.sessions)
+        tick_ms = [sample for session in self.sessions.values() for sample in session.tick_ms]
+        mean = sum(tick_ms) / len(tick_ms) if tick_ms else 0.0
+        line = ("sessions " + str(sessions) + "   load " + str(round(load * 100, 1)) + "%" +
+                "   tick " + str(round(mean, 3)) + " ms/session" +
+                "   dropped ticks " + str(self.dropped_ticks))
+        if load:
+            line += "   ~" + str(round(sessions / load)) + " sessions/core at " + str(self.tick_hz) + " Hz"
+        return line
+
+async def serve(host, port, server):
+    listener = await asyncio.start_server(server.handle, host, port)
+    print("Serving on " + host + ":" + str(port) + " at " + str(server.tick_hz) + " ticks/s")
+    async with listener:
+        await asyncio.gather(listener.serve_forever(), server.run_ticker())
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many concurrent games over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--tick-hz", type=int, default=TICK_HZ)
+    parser.add_argument("--send-every", type=int, default=1, help="send state every N ticks")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, GameServer(args.tick_hz, args.send_every)))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Run a World on its own thread at the fixed tick rate and hand the renderer
+immutable snapshots, so a slow frame never delays a tick and a slow tick
+never delays a frame.
+
+    runner = SimulationThread(world)
+    runner.start()
+    runner.post("shoot")     # from any thread: applied before the next tick
+    frame = runner.latest()  # RenderFrame of the last finished tick
+    runner.stop()
+
+Only the simulation thread touches the World. Actions go through a deque
+(append and popleft are atomic, so neither side takes a lock), and a new
+RenderFrame is published by swapping one reference: the renderer keeps
+drawing the front frame while the next one is built behind it.
+"""
+import threading
+import time
+from collections import deque
+
+from simulation import FIXED_DT, MAX_FRAME_TIME
+
+MAX_CATCH_UP = int(MAX_FRAME_TIME / FIXED_DT)  # Ticks run back to back after a stall; older ones are dropped
+
+class RenderFrame:
+    """Everything display() reads from a World, as of one tick: copies of
+    game_state and spaceship, frozen obstacle/projectile/power-up stores and
+    particles, and the background (shared by every frame of one scene;
+    only the render thread places it)"""
+    def __init__(self, world, background, published):
+        self.game_state = dict(world.game_state)
+        self.spaceship = dict(world.spaceship)
+        self.obstacles = world.obstacles.freeze()
+        self.projectiles = world.projectiles.freeze()
+        self.powerups = world.powerups.freeze()
+        self.particles = world.particles.freeze()
+        self.stars, self.nebulas, self.planets = background
+        self.profiler = world.profiler
+        self.published = published  # perf_counter time this frame's tick was due
+
+    @property
+    def alpha(self):
+        """Fraction of a tick since this frame's tick was due (render interpolation)"""
+        return min(max((time.perf_counter() - self.published) / FIXED_DT, 0.0), 1.0)
+
+    def place_background(self, now=None):
+        """World.place_background for this frame's copy of the background"""
+        if now is None:
+            now = self.game_state["sim_time"]
+        for store in (self.stars, self.nebulas, self.planets):
+            store.view_class.place(store, now)
+
+class SimulationThread(threading.Thread):
+    """Steps a World every FIXED_DT and publishes a RenderFrame after each pass"""
+    def __init__(self, world):
+        threading.Thread.__init__(self, name="simulation", daemon=True)
+        self.world = world
+        world.input_source = self.apply_inputs
+        self.inputs = deque()  # Actions posted since the last tick
+        self.stopping = threading.Event()
+        self.background = None
+        self.background_key = None  # Changes whenever the scene is rebuilt
+        self.dropped_ticks = 0
+        self.front = None
+        self.publish(time.perf_counter())
+
+    def post(self, action):
+        """Queue one of simulation.ACTIONS for the next tick"""
+        self.inputs.append(action)
+
+    def apply_inputs(self, world):
+        """World.input_source hook: apply every action posted since the last tick"""
+        inputs = self.inputs
+        while inputs:
+            world.apply_action(inputs.popleft())
+
+    def latest(self):
+        """The most recently published RenderFrame"""
+        return self.front
+
+    def publish(self, published):
+        world = self.world
+        key = (world.stars.next_uid, world.nebulas.next_uid, world.planets.next_uid)
+        if key != self.background_key:
+            self.background = (world.stars.copy(), world.nebulas.copy(), world.planets.copy())
+            self.background_key = key
+        front = self.front
+        if front is not None and front.game_state["tick"] == world.game_state["tick"]:
+            published = front.published  # No tick ran (paused, menus): keep alpha at 1, not cycling
+        self.front = RenderFrame(world, self.background, published)
+
+    def run(self):
+        world = self.world
+        next_tick = time.perf_counter()
+        while not self.stopping.is_set():
+            due = int((time.perf_counter() - next_tick) / FIXED_DT) + 1
+            if due > MAX_CATCH_UP:
+                self.dropped_ticks += due - MAX_CATCH_UP
+                next_tick += (due - MAX_CATCH_UP) * FIXED_DT
+                due = MAX_CATCH_UP
+            tick, start = world.game_state["tick"], time.perf_counter()
+            world.step(due)
+            if world.profiler.enabled and world.game_state["tick"] != tick:
+                # Only ticking passes are handed over: menus and pause never
+                # reach end_frame() to drain them
+                world.profiler.record("simulate", start, time.perf_counter())
+            next_tick += due * FIXED_DT
+            self.publish(next_tick - FIXED_DT)
+            self.stopping.wait(max(0.0, next_tick - time.perf_counter()))
+
+    def stop(self):
+        """Finish the current pass and stop (safe to call more than once)"""
+        self.stopping.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
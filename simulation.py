@@ -0,0 +1,803 @@
+"""Headless simulation core for Cosmic Flight (no OpenGL imports)"""
+import random
+import time
+import sys
+import struct
+import hashlib
+
+import numpy as np
+
+from entity_store import EntityStore, EntityView, Column, NameColumn, ParticlePool
+from collision import sphere_hits, point_hits
+from profiler import Profiler
+from events import EventLog
+
+# World Configuration
+WORLD_W, WORLD_H, WORLD_D = 1000.0, 700.0, 1000.0
+
+# Simulation clock: the game always advances in FIXED_DT ticks
+FIXED_DT = 1.0 / 60.0
+MAX_FRAME_TIME = 0.25  # Real time beyond this per frame is dropped, not simulated
+
+# Game Configuration
+INITIAL_LIVES = 3
+INITIAL_AMMO = 20
+AMMO_RECHARGE_TIME = 3.0  # Seconds to recharge 1 ammo
+
+# Scene Configuration
+STAR_COUNT = 600
+# Background bodies leave at the left edge and come back in at the right
+BACKGROUND_WRAP_X = -WORLD_W/2 - 100
+BACKGROUND_SPAN = WORLD_W + 200
+
+# Effects Configuration
+PARTICLE_CAP = 2048  # Max live explosion particles (oldest are recycled)
+EXPLOSION_PARTICLES = 15
+
+# Level Configuration
+LEVEL_CONFIG = {
+    1: {
+        "obstacle_speed": 200.0,
+        "obstacle_count": 15,
+        "obstacle_health": 1,
+        "spawn_penalty_obstacles": False,
+        "penalty_ratio": 0.0
+    },
+    2: {
+        "obstacle_speed": 280.0,
+        "obstacle_count": 20,
+        "obstacle_health": 1,
+        "spawn_penalty_obstacles": True,
+        "penalty_ratio": 0.3  # 30% of obstacles are penalty
+    },
+    3: {
+        "obstacle_speed": 400.0,
+        "obstacle_count": 25,
+        "obstacle_health": 3,  # Require multiple hits
+        "spawn_penalty_obstacles": True,
+        "penalty_ratio": 0.25
+    }
+}
+
+# Player actions understood by World.apply_action
+ACTIONS = ["up", "down", "left", "right", "shoot", "camera", "pause", "help", "click"]
+
+# =========================
+# HELPER CLASSES
+# =========================
+# Each entity is a thin view onto a row of an EntityStore; the per-frame
+# motion is done for the whole store at once by EntityStore.integrate.
+# Constructors draw their random properties from the `rng` stream they are given;
+# the background (stars, nebulas, planets) is instead generated in bulk by
+# populate() from the numpy "scene" stream, and is never stepped at all:
+# BackgroundBody.place() computes where it is at any simulation time.
+
+def hash_uniform(keys, counters):
+    """Uniform floats in [0, 1), a fixed function of each (key, counter) pair (splitmix64)"""
+    z = keys.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) + counters.astype(np.uint64)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return (z >> np.uint64(11)).astype(np.float64) * 2.0**-53
+
+class BackgroundBody(EntityView):
+    """Scenery drifting left at a constant velocity, wrapping from the left
+    edge (BACKGROUND_WRAP_X) back to the right. x0/y0/rotation0 hold the
+    (unwrapped) state at sim_time 0, so position and spin are closed-form
+    functions of the simulation clock."""
+    EXTRA_COLUMNS = ("x0", "y0", "rotation0", "wrap_seed")
+    INTEGRATED = ()
+    AGES = False
+    REROLL_Y = False  # Whether each wrap comes back in at a new height
+
+    @staticmethod
+    def set_origin(store, rows, rng, now):
+        """Record the rows' current x/y/rotation (at sim_time `now`) as their origin"""
+        arrays = store.arrays
+        arrays["x0"][rows] = arrays["x"][rows] - arrays["vx"][rows] * now
+        arrays["y0"][rows] = arrays["y"][rows]
+        arrays["rotation0"][rows] = arrays["rotation"][rows] - arrays["spin"][rows] * now
+        arrays["wrap_seed"][rows] = rng.integers(0, 2**24, len(arrays["x"][rows]))  # Exact in float32
+
+    @classmethod
+    def place(cls, store, now):
+        """Set x, y and rotation of every body in `store` for sim_time `now`"""
+        n = store.count
+        if n == 0:
+            return
+        arrays = store.arrays
+        travel = arrays["x0"][:n] - BACKGROUND_WRAP_X + arrays["vx"][:n] * np.float64(now)
+        laps = np.floor(travel / BACKGROUND_SPAN)  # Minus the number of wraps so far
+        arrays["x"][:n] = BACKGROUND_WRAP_X + (travel - laps * BACKGROUND_SPAN)
+        arrays["rotation"][:n] = np.mod(arrays["rotation0"][:n] + arrays["spin"][:n] * np.float64(now), 360.0)
+        if cls.REROLL_Y:
+            wraps = -laps
+            height = hash_uniform(arrays["wrap_seed"][:n], wraps) * WORLD_H - WORLD_H/2
+            arrays["y"][:n] = np.where(wraps > 0, height, arrays["y0"][:n])
+
+class Star(BackgroundBody):
+    EXTRA_COLUMNS = BackgroundBody.EXTRA_COLUMNS + ("brightness", "twinkle_speed", "twinkle_offset")
+    REROLL_Y = True
+    brightness = Column("brightness")
+    twinkle_speed = Column("twinkle_speed")
+    twinkle_offset = Column("twinkle_offset")
+
+    @staticmethod
+    def populate(store, count, rng, now=0.0):
+        """Add `count` stars, every column drawn in one call"""
+        rows = store.extend(count)
+        arrays = store.arrays
+        arrays["x"][rows] = rng.uniform(-WORLD_W/2, WORLD_W/2, count)
+        arrays["y"][rows] = rng.uniform(-WORLD_H/2, WORLD_H/2, count)
+        arrays["z"][rows] = rng.uniform(-800, 800, count)
+        arrays["vx"][rows] = -80
+        arrays["brightness"][rows] = rng.uniform(0.3, 1.0, count)
+        arrays["twinkle_speed"][rows] = rng.uniform(0.5, 2.0, count)
+        arrays["twinkle_offset"][rows] = rng.uniform(0, 6.28, count)
+        BackgroundBody.set_origin(store, rows, rng, now)
+
+class Nebula(BackgroundBody):
+    @staticmethod
+    def populate(store, count, rng, now=0.0):
+        """Add `count` nebulas, every column drawn in one call"""
+        rows = store.extend(count)
+        arrays = store.arrays
+        arrays["x"][rows] = rng.uniform(-WORLD_W/2, WORLD_W/2, count)
+        arrays["y"][rows] = rng.uniform(-WORLD_H/2, WORLD_H/2, count)
+        arrays["z"][rows] = rng.uniform(-600, -200, count)
+        arrays["vx"][rows] = -40
+        arrays["size"][rows] = rng.uniform(40, 80, count)
+        arrays["r"][rows] = rng.uniform(0.3, 0.8, count)
+        arrays["g"][rows] = rng.uniform(0.1, 0.5, count)
+        arrays["b"][rows] = rng.uniform(0.5, 1.0, count)
+        arrays["rotation"][rows] = rng.uniform(0, 360, count)
+        arrays["spin"][rows] = 10
+        BackgroundBody.set_origin(store, rows, rng, now)
+
+class Planet(BackgroundBody):
+    @staticmethod
+    def populate(store, count, rng, now=0.0):
+        """Add `count` planets, every column drawn in one call"""
+        rows = store.extend(count)
+        arrays = store.arrays
+        arrays["x"][rows] = rng.uniform(-WORLD_W/2, WORLD_W/2, count)
+        arrays["y"][rows] = rng.uniform(-WORLD_H/2, WORLD_H/2, count)
+        arrays["z"][rows] = rng.uniform(-500, -200, count)
+        arrays["vx"][rows] = -60
+        arrays["size"][rows] = rng.uniform(30, 60, count)
+        for channel in ("r", "g", "b"):
+            arrays[channel][rows] = rng.uniform(0.2, 0.9, count)
+        arrays["rotation"][rows] = rng.uniform(0, 360, count)
+        arrays["spin"][rows] = rng.uniform(5, 15, count)
+        BackgroundBody.set_origin(store, rows, rng, now)
+
+class Obstacle(EntityView):
+    INTEGRATED = (("x", "vx"), ("rotation", "spin"), ("phase", "phase_rate"))
+    AGES = False
+    SHAPES = ['cube', 'sphere', 'pyramid', 'torus']
+    shape = NameColumn("kind", SHAPES)
+    is_penalty = Column("flag", bool)
+    health = Column("health", int)
+    max_health = Column("max_health", int)
+    glow_phase = Column("phase")
+
+    def __init__(self, store, rng, config, is_penalty=False):
+        EntityView.__init__(self, store)
+        self.reset(rng, config, is_penalty)
+
+    def reset(self, rng, config, is_penalty=False):
+        """(Re)initialize this obstacle's freshly zeroed row"""
+        self.x = WORLD_W/2 + 200
+        self.y = rng.uniform(-WORLD_H/2 + 100, WORLD_H/2 - 100)
+        self.z = rng.uniform(-170, 170)
+        self.size = rng.uniform(15, 30)
+        self.rotation = rng.uniform(0, 360)
+        self.rotation_speed = rng.uniform(30, 100)
+
+        # Level-based properties (config is one LEVEL_CONFIG entry)
+        self.health = config["obstacle_health"]
+        self.max_health = config["obstacle_health"]
+        self.speed = config["obstacle_speed"]
+
+        # Penalty obstacle (RED - shooting causes damage)
+        self.is_penalty = is_penalty
+        if is_penalty:
+            self.color = [1.0, 0.0, 0.0]  # Red
+            self.glow_phase = rng.uniform(0, 6.28)
+            self.store.arrays["phase_rate"][self.index] = 3
+        else:
+            # Normal obstacles (various colors)
+            self.color = [
+                rng.uniform(0.3, 0.9),
+                rng.uniform(0.3, 0.9),
+                rng.uniform(0.3, 0.9)
+            ]
+
+        # Obstacle type (visual variety)
+        self.shape = rng.choice(self.SHAPES)
+
+    @property
+    def speed(self):
+        return -self.vx
+
+    @speed.setter
+    def speed(self, value):
+        self.vx = -value
+
+class Projectile(EntityView):
+    INTEGRATED = (("x", "vx"),)
+
+    def __init__(self, store, x, y, z):
+        EntityView.__init__(self, store)
+        self.reset(x, y, z)
+
+    def reset(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.speed = 600.0
+        self.life = 2.0  # Seconds before disappearing
+
+    @property
+    def speed(self):
+        return self.vx
+
+    @speed.setter
+    def speed(self, value):
+        self.vx = value
+
+class PowerUp(EntityView):
+    """NEW FEATURE 1: Power-ups that spawn randomly"""
+    INTEGRATED = (("x", "vx"), ("rotation", "spin"), ("phase", "phase_rate"))
+    AGES = False
+    TYPES = ['ammo', 'shield', 'health']
+    type = NameColumn("kind", TYPES)
+    collected = Column("flag", bool)
+    bob_offset = Column("phase")
+
+    def __init__(self, store, rng):
+        EntityView.__init__(self, store)
+        self.reset(rng)
+
+    def reset(self, rng):
+        self.x = WORLD_W/2 + 200
+        self.y = rng.uniform(-WORLD_H/2 + 100, WORLD_H/2 - 100)
+        self.z = rng.uniform(-30, 30)
+        self.vx = -150
+        self.size = 15
+        self.rotation = 0
+        self.rotation_speed = 180
+        self.type = rng.choice(self.TYPES)
+        self.collected = False
+        self.bob_offset = rng.uniform(0, 6.28)
+        self.store.arrays["phase_rate"][self.index] = 2
+
+# =========================
+# WORLD
+# =========================
+
+def new_game_state():
+    """Fresh game_state dict"""
+    return {
+        "in_start_screen": True,
+        "game_over": False,
+        "cause_of_death": None,  # "collision" or "penalty" once game_over is set
+        "paused": False,
+        "level": 1,
+        "score": 0,
+        "lives": INITIAL_LIVES,
+        "ammo": INITIAL_AMMO,
+        "tick": 0,  # Simulation ticks run
+        "sim_time": 0.0,  # Simulation clock (seconds), only advances while playing
+        "last_ammo_recharge": 0.0,
+        "camera_mode": "third_person",  # or "first_person"
+        "last_time": 0.0,
+        "show_instructions": False
+    }
+
+def new_spaceship():
+    """Fresh spaceship dict"""
+    return {
+        "x": -200.0,
+        "y": 0.0,
+        "z": 0.0,
+        "rotation": 0.0,
+        "speed": 300.0,  # Movement speed
+        "health": 100,
+        "max_health": 100,
+        "shield_active": False,
+        "shield_time": 0.0
+    }
+
+def rng_streams(seed):
+    """Independent RNG per subsystem, all derived from one seed"""
+    return {
+        "scene": np.random.default_rng([seed, 4]),  # Background only, drawn in bulk
+        "spawns": random.Random(str(seed) + ":spawns"),
+        "powerups": random.Random(str(seed) + ":powerups"),
+        "particles": np.random.default_rng([seed, 3])
+    }
+
+class World:
+    """All simulation state for one game, steppable without a window.
+    Runs are reproducible: the same seed and the same actions on the same
+    ticks always give the same game."""
+    def __init__(self, seed=None, level_config=None, star_count=STAR_COUNT, particle_cap=PARTICLE_CAP,
+                 initial_ammo=INITIAL_AMMO, ammo_recharge_time=AMMO_RECHARGE_TIME, echo=False):
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.rng = rng_streams(seed)
+        self.level_config = level_config if level_config is not None else LEVEL_CONFIG
+        self.star_count = star_count
+        self.initial_ammo = initial_ammo
+        self.ammo_recharge_time = ammo_recharge_time
+        self.game_state = new_game_state()
+        self.game_state["ammo"] = initial_ammo
+        self.spaceship = new_spaceship()
+
+        # Fixed-timestep bookkeeping for advance()
+        self.accumulator = 0.0
+        self.alpha = 0.0  # Fraction of a tick the renderer is ahead of the last state
+
+        # Optional hooks (see replay.py): input_source(world) is called before
+        # every tick to apply queued actions; observer.on_action(world, action)
+        # and observer.on_tick(world) see every action and finished tick
+        self.input_source = None
+        self.observer = None
+
+        # Per-phase timings (disabled until someone turns it on; see profiler.py)
+        self.profiler = Profiler()
+
+        # Gameplay events (collisions, pickups, level-ups...; see events.py),
+        # printed to the console only when echo is on
+        self.events = EventLog(echo=echo)
+
+        # Collections (array-backed, iterate like lists of entities)
+        self.stars = EntityStore(Star, capacity=1024)
+        self.nebulas = EntityStore(Nebula, capacity=16)
+        self.planets = EntityStore(Planet, capacity=8)
+        self.obstacles = EntityStore(Obstacle)
+        self.projectiles = EntityStore(Projectile)
+        self.powerups = EntityStore(PowerUp, capacity=8)
+        self.particles = ParticlePool(particle_cap, rng=self.rng["particles"])
+
+    # -------------------------
+    # Scene setup
+    # -------------------------
+
+    def initialize_scene(self):
+        """Initialize all scene objects"""
+        self.stars.clear()
+        self.nebulas.clear()
+        self.planets.clear()
+        self.obstacles.clear()
+        self.powerups.clear()
+
+        # Background: stars, nebulas and planets (placed by place_background).
+        # These stores are never stepped, so their old views are pooled here
+        for store in (self.stars, self.nebulas, self.planets):
+            store.recycle()
+        now = self.game_state["sim_time"]
+        Star.populate(self.stars, self.star_count, self.rng["scene"], now)
+        Nebula.populate(self.nebulas, 8, self.rng["scene"], now)
+        Planet.populate(self.planets, 5, self.rng["scene"], now)
+
+        # Create initial obstacles
+        self.spawn_obstacles()
+
+    def new_obstacle(self):
+        """Add one obstacle for the current level at the spawn edge"""
+        rng = self.rng["spawns"]
+        level = self.game_state["level"]
+        config = self.level_config[level]
+        is_penalty = False
+        if config["spawn_penalty_obstacles"]:
+            is_penalty = rng.random() < config["penalty_ratio"]
+        return Obstacle.spawn(self.obstacles, rng, config, is_penalty)
+
+    def spawn_obstacles(self):
+        """Spawn obstacles based on current level"""
+        config = self.level_config[self.game_state["level"]]
+
+        self.obstacles.clear()
+
+        spacing = 150.0
+        for i in range(config["obstacle_count"]):
+            obs = self.new_obstacle()
+            obs.x = WORLD_W/2 + 200 + i * spacing
+
+    def spawn_powerup(self):
+        """Spawn a random power-up"""
+        rng = self.rng["powerups"]
+        if rng.random() < 0.15:  # 15% chance per spawn cycle
+            PowerUp.spawn(self.powerups, rng)
+
+    def emit(self, kind, text=None, **fields):
+        """Log a gameplay event at the current tick (see events.EventLog.emit)"""
+        self.events.emit(kind, self.game_state["tick"], text, **fields)
+
+    def create_explosion(self, x, y, z, color):
+        """Create particle explosion effect"""
+        self.particles.emit(x, y, z, color, EXPLOSION_PARTICLES)
+
+    # -------------------------
+    # Player actions
+    # -------------------------
+
+    def start_game(self):
+        """Leave the start screen and build the first scene"""
+        self.game_state["in_start_screen"] = False
+        self.game_state["last_ammo_recharge"] = self.game_state["sim_time"]
+        self.initialize_scene()
+        self.emit("game_start", "\nGame started!")
+
+    def restart_game(self):
+        """Reset score, lives and ship after a game over"""
+        game_state = self.game_state
+        spaceship = self.spaceship
+        game_state["game_over"] = False
+        game_state["cause_of_death"] = None
+        game_state["score"] = 0
+        game_state["lives"] = INITIAL_LIVES
+        game_state["ammo"] = self.initial_ammo
+        game_state["level"] = 1
+        spaceship["health"] = spaceship["max_health"]
+        spaceship["x"] = -200.0
+        spaceship["y"] = 0.0
+        spaceship["shield_active"] = False
+        game_state["last_ammo_recharge"] = game_state["sim_time"]
+        self.initialize_scene()
+        self.emit("game_restart", "\nGame restarted!")
+
+    def shoot_projectile(self):
+        """Fire a projectile from the spaceship"""
+        if self.game_state["ammo"] > 0 and not self.game_state["game_over"]:
+            Projectile.spawn(
+                self.projectiles,
+                self.spaceship["x"] + 40,
+                self.spaceship["y"],
+                self.spaceship["z"]
+            )
+            self.game_state["ammo"] -= 1
+
+    def move_ship(self, direction):
+        """Move the ship one step up/down (vertical) or left/right (depth)"""
+        if self.game_state["paused"] or self.game_state["game_over"]:
+            return
+
+        spaceship = self.spaceship
+        move_speed = 15
+
+        if direction == "up":
+            spaceship["y"] += move_speed
+            spaceship["y"] = min(spaceship["y"], WORLD_H/2 - 50)
+        elif direction == "down":
+            spaceship["y"] -= move_speed
+            spaceship["y"] = max(spaceship["y"], -WORLD_H/2 + 50)
+        elif direction == "left":
+            # Add left movement with less restricted threshold
+            spaceship["z"] -= move_speed
+            spaceship["z"] = max(spaceship["z"], -170)  # Expanded to -250
+        elif direction == "right":
+            # Add right movement with less restricted threshold
+            spaceship["z"] += move_speed
+            spaceship["z"] = min(spaceship["z"], 170)  # Expanded to +250
+
+    def apply_action(self, action):
+        """Apply one player action (see ACTIONS)"""
+        game_state = self.game_state
+        if self.observer is not None:
+            self.observer.on_action(self, action)
+        if action in ("up", "down", "left", "right"):
+            self.move_ship(action)
+        elif action == "shoot":
+            self.shoot_projectile()
+        elif action == "camera":
+            # Toggle camera
+            if game_state["camera_mode"] == "third_person":
+                game_state["camera_mode"] = "first_person"
+                self.emit("camera", "First-person camera", mode="first_person")
+            else:
+                game_state["camera_mode"] = "third_person"
+                self.emit("camera", "Third-person camera", mode="third_person")
+        elif action == "pause":
+            # Toggle pause
+            game_state["paused"] = not game_state["paused"]
+            if game_state["paused"]:
+                self.emit("pause", "Paused")
+            else:
+                self.emit("resume", "Resumed")
+        elif action == "help":
+            # Toggle instructions
+            game_state["show_instructions"] = not game_state["show_instructions"]
+        elif action == "click":
+            if game_state["in_start_screen"]:
+                self.start_game()
+            elif game_state["game_over"]:
+                self.restart_game()
+
+    # -------------------------
+    # Simulation
+    # -------------------------
+
+    def check_collisions(self, dt=FIXED_DT):
+        """Check all collision types over the tick that just ran.
+        Tests are swept along each entity's motion during the last `dt`
+        seconds, so nothing tunnels through however coarse the tick is."""
+        game_state = self.game_state
+        spaceship = self.spaceship
+        obstacles = self.obstacles
+        projectiles = self.projectiles
+        powerups = self.powerups
+
+        ship_x, ship_y, ship_z = spaceship["x"], spaceship["y"], spaceship["z"]
+        ship_radius = 30  # Increased for better collision detection
+
+        # Projectile vs Obstacle collisions: each projectile hits at most the
+        # first obstacle it reaches, if it was still alive and in range then
+        # More lenient collision detection - obstacle size + 5 buffer
+        proj_idx, obs_idx, toi = sphere_hits(projectiles.positions(), projectiles.velocities(), 0.0,
+                                             obstacles.positions(), obstacles.velocities(),
+                                             obstacles.column("size") + 5, dt)
+        hits = []
+        if len(proj_idx):
+            first = np.ones(len(proj_idx), bool)
+            first[1:] = proj_idx[1:] != proj_idx[:-1]
+            proj_idx, obs_idx, toi = proj_idx[first], obs_idx[first], toi[first]
+            since_contact = (1.0 - toi) * dt
+            in_play = ((projectiles.column("life")[proj_idx] + since_contact > 0) &
+                       (projectiles.column("x")[proj_idx] - projectiles.column("vx")[proj_idx] * since_contact
+                        <= WORLD_W/2 + 200))
+            # Resolve hits in the order they happened during the tick
+            order = np.argsort(toi, kind="stable")
+            hits = [(projectiles[i], obstacles[j])
+                    for i, j, hit in zip(proj_idx[order], obs_idx[order], in_play[order]) if hit]
+
+        for proj, obs in hits:
+            if obs not in obstacles:
+                # Destroyed (or replaced by a level change) earlier this frame
+                continue
+
+            # Hit!
+            projectiles.remove(proj)
+
+            if obs.is_penalty:
+                # Penalty: lose life for shooting red obstacles
+                game_state["lives"] -= 1
+                spaceship["health"] -= 30
+                self.create_explosion(obs.x, obs.y, obs.z, [1.0, 0.0, 0.0])
+                if spaceship["health"] < 0:
+                    spaceship["health"] = 0
+                self.emit("penalty_hit", "WARNING: Hit penalty obstacle! Lives: " + str(game_state['lives']),
+                          projectile=proj.uid, obstacle=obs.uid, lives_delta=-1, lives=game_state["lives"],
+                          health=spaceship["health"])
+                if game_state["lives"] <= 0:
+                    game_state["game_over"] = True
+                    game_state["cause_of_death"] = "penalty"
+                    self.emit("game_over", cause="penalty", score=game_state["score"], level=game_state["level"])
+            else:
+                # Normal obstacle: reduce health
+                obs.health -= 1
+                self.create_explosion(obs.x, obs.y, obs.z, obs.color)
+
+                if obs.health <= 0:
+                    # Destroyed!
+                    obstacles.remove(obs)
+                    game_state["score"] += 10
+                    self.emit("obstacle_destroyed", projectile=proj.uid, obstacle=obs.uid,
+                              score_delta=10, score=game_state["score"])
+
+                    # Respawn new obstacle
+                    self.new_obstacle()
+
+                    # Check level progression
+                    if game_state["score"] >= game_state["level"] * 100 and game_state["level"] < max(self.level_config):
+                        self.advance_level()
+                else:
+                    self.emit("obstacle_hit", projectile=proj.uid, obstacle=obs.uid, health=obs.health)
+
+        # Expired and out-of-range projectiles
+        projectiles.remove_where((projectiles.column("life") <= 0) |
+                                 (projectiles.column("x") > WORLD_W/2 + 200))
+
+        # Ship vs Obstacle collisions (if shield not active)
+        if not spaceship["shield_active"]:
+            # More lenient collision detection for ship - obstacle size + 10 buffer
+            touching, _ = point_hits(ship_x, ship_y, ship_z, ship_radius,
+                                     obstacles.positions(), obstacles.velocities(),
+                                     obstacles.column("size") + 10, dt)
+            if len(touching):
+                # Collision!
+                obs = obstacles[touching[0]]
+                game_state["lives"] -= 1
+                spaceship["health"] -= 40
+                self.create_explosion(obs.x, obs.y, obs.z, obs.color)
+
+                # Respawn obstacle
+                obs.x = WORLD_W/2 + 200
+                obs.y = self.rng["spawns"].uniform(-WORLD_H/2 + 100, WORLD_H/2 - 100)
+
+                if spaceship["health"] < 0:
+                    spaceship["health"] = 0
+
+                self.emit("ship_collision",
+                          "COLLISION! Lives remaining: " + str(game_state['lives']) + ", Health: " + str(spaceship['health']),
+                          obstacle=obs.uid, lives_delta=-1, lives=game_state["lives"], health=spaceship["health"])
+
+                if game_state["lives"] <= 0:
+                    game_state["game_over"] = True
+                    game_state["cause_of_death"] = "collision"
+                    self.emit("game_over", cause="collision", score=game_state["score"], level=game_state["level"])
+
+        # Ship vs PowerUp collisions
+        # Increased collision range for powerups - power-up size + 15 buffer
+        touching, _ = point_hits(ship_x, ship_y, ship_z, ship_radius,
+                                 powerups.positions(), powerups.velocities(),
+                                 powerups.column("size") + 15, dt)
+        for pup in [powerups[i] for i in touching]:
+            if pup.collected:
+                continue
+
+            pup.collected = True
+            pup_type = pup.type
+            powerups.remove(pup)
+
+            if pup_type == 'ammo':
+                game_state["ammo"] += 10
+                self.emit("powerup", "Ammo +10! Total: " + str(game_state['ammo']),
+                          powerup=pup.uid, item="ammo", ammo=game_state["ammo"])
+            elif pup_type == 'shield':
+                spaceship["shield_active"] = True
+                spaceship["shield_time"] = game_state["sim_time"]
+                self.emit("powerup", "Shield activated!", powerup=pup.uid, item="shield")
+            elif pup_type == 'health':
+                spaceship["health"] = min(spaceship["health"] + 30, spaceship["max_health"])
+                self.emit("powerup", "Health +30! Total: " + str(spaceship['health']),
+                          powerup=pup.uid, item="health", health=spaceship["health"])
+
+    def advance_level(self):
+        """Advance to next level"""
+        self.game_state["level"] += 1
+        self.emit("level_up", "\nLEVEL " + str(self.game_state['level']) + " REACHED!\nNew obstacles incoming...",
+                  level=self.game_state["level"])
+        self.spawn_obstacles()
+
+    def update_game(self, dt):
+        """Update all game objects"""
+        game_state = self.game_state
+        spaceship = self.spaceship
+        if game_state["paused"] or game_state["game_over"] or game_state["in_start_screen"]:
+            return
+
+        game_state["tick"] += 1
+        game_state["sim_time"] += dt
+
+        profiler = self.profiler
+
+        # Update obstacles
+        with profiler.span("sim obstacles"):
+            self.obstacles.integrate(dt)
+            passed = self.obstacles.column("x") < -WORLD_W/2 - 200
+            self.obstacles.remove_where(passed)
+            for _ in range(int(passed.sum())):
+                # Spawn new obstacle
+                self.new_obstacle()
+
+                # Award survival points
+                game_state["score"] += 1
+
+        # Update projectiles (expired ones are dropped by check_collisions, after
+        # their last stretch of flight has been tested) and powerups
+        with profiler.span("sim projectiles"):
+            self.projectiles.integrate(dt)
+            self.powerups.integrate(dt)
+            self.powerups.remove_where(self.powerups.column("x") < -WORLD_W/2 - 200)
+
+        # Update particles
+        with profiler.span("sim particles"):
+            self.particles.update(dt)
+
+        # Spawn powerups randomly
+        if self.rng["powerups"].random() < 0.002:  # Small chance each tick
+            self.spawn_powerup()
+
+        # Ammo recharge over time
+        current_time = game_state["sim_time"]
+        if current_time - game_state["last_ammo_recharge"] >= self.ammo_recharge_time:
+            if game_state["ammo"] < self.initial_ammo:
+                game_state["ammo"] += 1
+            game_state["last_ammo_recharge"] = current_time
+
+        # Shield duration check (NEW FEATURE 2: Temporary shield)
+        if spaceship["shield_active"]:
+            if current_time - spaceship["shield_time"] > 5.0:  # 5 second shield
+                spaceship["shield_active"] = False
+                self.emit("shield_off", "Shield deactivated")
+
+        # Check collisions
+        with profiler.span("sim collisions"):
+            self.check_collisions(dt)
+
+        # Entities removed this tick become reusable from the next one
+        for store in (self.obstacles, self.projectiles, self.powerups):
+            store.recycle()
+
+        if self.observer is not None:
+            self.observer.on_tick(self)
+
+    def place_background(self, now=None):
+        """Move the stars, nebulas and planets to where they are at sim_time
+        `now` (default: the current tick). Only renderers need this; the
+        simulation itself never reads the background."""
+        if now is None:
+            now = self.game_state["sim_time"]
+        Star.place(self.stars, now)
+        Nebula.place(self.nebulas, now)
+        Planet.place(self.planets, now)
+
+    def step(self, steps=1, dt=FIXED_DT):
+        """Advance the simulation by `steps` ticks"""
+        for _ in range(steps):
+            if self.input_source is not None:
+                self.input_source(self)
+            self.update_game(dt)
+
+    def state_hash(self):
+        """Short digest of the gameplay state (counters, ship, obstacles,
+        projectiles, power-ups), for spotting where two runs diverge"""
+        game_state = self.game_state
+        spaceship = self.spaceship
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(struct.pack(
+            "<qqqqqdddd?",
+            game_state["tick"], game_state["level"], game_state["score"],
+            game_state["lives"], game_state["ammo"],
+            spaceship["x"], spaceship["y"], spaceship["z"], spaceship["health"],
+            spaceship["shield_active"]
+        ))
+        for store in (self.obstacles, self.projectiles, self.powerups):
+            for array in store.arrays.values():
+                digest.update(array[:store.count].tobytes())
+        return digest.digest()
+
+    def advance(self, frame_time):
+        """Fixed-timestep loop: bank `frame_time` seconds of real time and run
+        every whole FIXED_DT tick it covers. Leaves the leftover fraction of a
+        tick in self.alpha for render interpolation and returns the ticks run."""
+        self.accumulator += min(frame_time, MAX_FRAME_TIME)
+        ticks = int(self.accumulator / FIXED_DT)
+        self.accumulator -= ticks * FIXED_DT
+        self.step(ticks)
+        self.alpha = self.accumulator / FIXED_DT
+        return ticks
+
+# =========================
+# MAIN
+# =========================
+
+def main():
+    """Headless soak run: python simulation.py [frames] [seed] [dt]"""
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    dt = float(sys.argv[3]) if len(sys.argv) > 3 else FIXED_DT
+
+    world = World(seed)
+    world.apply_action("click")
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        if world.game_state["game_over"]:
+            world.apply_action("click")
+        world.step(dt=dt)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "="*50)
+    print("Simulated " + str(frames) + " frames in " + str(round(elapsed, 3)) + "s")
+    print("Frames per second: " + str(round(frames / max(elapsed, 1e-9))))
+    print("Simulated seconds per second: " + str(round(frames * dt / max(elapsed, 1e-9), 1)))
+    print("Events logged: " + str(world.events.emitted))
+    print("="*50)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""Binary world snapshots, save/load, and a delta-encoded rewind buffer.
+
+    data = capture(world)              # bytes; cheap enough to take every tick
+    restore(world, data)               # world is now exactly as captured
+    save(world, "run.cfs")
+    world = load("run.cfs")            # a new World, ready to step
+
+    rewind = RewindBuffer()
+    world.observer = rewind            # or call rewind.record(world) after each tick
+    branch = rewind.branch(tick)       # independent World at any buffered tick
+
+A snapshot holds the game settings, every game_state/spaceship value, the
+state of every RNG stream and every entity column, so stepping a restored
+World gives exactly the game the original would have played. Only live
+particles are kept (dead slots are invisible and rewritten before reuse).
+"""
+import json
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+
+from simulation import World
+
+MAGIC = b"CFSS"
+VERSION = 2  # Bumped whenever the layout or the simulation rules change
+
+HEADER = struct.Struct("<4sHI")  # magic, version, settings JSON length
+COUNT = struct.Struct("<I")
+UID = struct.Struct("<Q")
+
+# (key, struct format) of every game_state and spaceship value; strings are
+# stored as an index into their choices
+CHOICES = {
+    "cause_of_death": [None, "collision", "penalty"],
+    "camera_mode": ["third_person", "first_person"]
+}
+GAME_STATE_FIELDS = [
+    ("in_start_screen", "?"), ("game_over", "?"), ("cause_of_death", "B"), ("paused", "?"),
+    ("level", "q"), ("score", "q"), ("lives", "q"), ("ammo", "q"), ("tick", "q"),
+    ("sim_time", "d"), ("last_ammo_recharge", "d"), ("camera_mode", "B"), ("last_time", "d"),
+    ("show_instructions", "?")
+]
+SPACESHIP_FIELDS = [
+    ("x", "d"), ("y", "d"), ("z", "d"), ("rotation", "d"), ("speed", "d"),
+    ("health", "q"), ("max_health", "q"), ("shield_active", "?"), ("shield_time", "d")
+]
+STATE = struct.Struct("<" + "".join(fmt for _, fmt in GAME_STATE_FIELDS + SPACESHIP_FIELDS) + "d")
+
+PYTHON_RNGS = ("spawns", "powerups")  # random.Random streams
+NUMPY_RNGS = ("scene", "particles")  # np.random.Generator (PCG64) streams
+MT_STATE = struct.Struct("<B625I?d")  # version, Mersenne Twister words + position, gauss_next
+PCG_STATE = struct.Struct("<16s16sII")  # state, increment, has_uint32, uinteger
+
+STORES = ("stars", "nebulas", "planets", "obstacles", "powerups", "projectiles")
+PARTICLE_FIELDS = ("position", "velocity", "color", "life", "size")
+
+# =========================
+# SNAPSHOTS
+# =========================
+
+def settings(world):
+    """Everything needed to construct a World the snapshot can be restored into"""
+    return {"seed": world.seed, "level_config": world.level_config, "star_count": world.star_count,
+            "particle_cap": world.particles.capacity, "initial_ammo": world.initial_ammo,
+            "ammo_recharge_time": world.ammo_recharge_time}
+
+def pack_state(world):
+    values = []
+    for fields, source in ((GAME_STATE_FIELDS, world.game_state), (SPACESHIP_FIELDS, world.spaceship)):
+        for key, _ in fields:
+            value = source[key]
+            values.append(CHOICES[key].index(value) if key in CHOICES else value)
+    values.append(world.accumulator)
+    return STATE.pack(*values)
+
+def unpack_state(world, data, offset):
+    values = STATE.unpack_from(data, offset)
+    i = 0
+    for fields, target in ((GAME_STATE_FIELDS, world.game_state), (SPACESHIP_FIELDS, world.spaceship)):
+        for key, _ in fields:
+            target[key] = CHOICES[key][values[i]] if key in CHOICES else values[i]
+            i += 1
+    world.accumulator = values[i]
+    return offset + STATE.size
+
+def pack_rngs(world):
+    parts = []
+    for name in PYTHON_RNGS:
+        version, words, gauss_next = world.rng[name].getstate()
+        parts.append(MT_STATE.pack(version, *words, gauss_next is not None, gauss_next or 0.0))
+    for name in NUMPY_RNGS:
+        state = world.rng[name].bit_generator.state
+        parts.append(PCG_STATE.pack(state["state"]["state"].to_bytes(16, "little"),
+                                    state["state"]["inc"].to_bytes(16, "little"),
+                                    state["has_uint32"], state["uinteger"]))
+    return b"".join(parts)
+
+def unpack_rngs(world, data, offset):
+    for name in PYTHON_RNGS:
+        values = MT_STATE.unpack_from(data, offset)
+        offset += MT_STATE.size
+        world.rng[name].setstate((values[0], values[1:626], values[627] if values[626] else None))
+    for name in NUMPY_RNGS:
+        state, inc, has_uint32, uinteger = PCG_STATE.unpack_from(data, offset)
+        offset += PCG_STATE.size
+        world.rng[name].bit_generator.state = {
+            "bit_generator": "PCG64",
+            "state": {"state": int.from_bytes(state, "little"), "inc": int.from_bytes(inc, "little")},
+            "has_uint32": has_uint32, "uinteger": uinteger}
+    return offset
+
+def pack_store(store):
+    count = store.count
+    uids = np.fromiter((view.uid for view in store.views), np.uint64, count)
+    parts = [COUNT.pack(count), UID.pack(store.next_uid), uids.tobytes()]
+    parts.extend(store.arrays[name][:count].tobytes() for name in sorted(store.arrays))
+    return b"".join(parts)
+
+def unpack_store(store, data, offset):
+    (count,) = COUNT.unpack_from(data, offset)
+    (next_uid,) = UID.unpack_from(data, offset + COUNT.size)
+    offset += COUNT.size + UID.size
+    uids = np.frombuffer(data, np.uint64, count, offset)
+    offset += uids.nbytes
+    # Reuse the store's views: drop the extra ones or add bare ones as needed
+    views = store.views
+    for view in views[count:]:
+        view.index = -1
+    del views[count:]
+    store.count = len(views)
+    if count > store.count:
+        store.extend(count - store.count)
+    for view, uid in zip(views, uids.tolist()):
+        view.uid = uid
+    store.next_uid = next_uid
+    for name in sorted(store.arrays):
+        column = store.arrays[name]
+        values = np.frombuffer(data, column.dtype, count, offset)
+        column[:count] = values
+        offset += values.nbytes
+    return offset
+
+def pack_particles(pool):
+    live = np.flatnonzero(pool.life > 0).astype(np.uint32)
+    parts = [COUNT.pack(pool.head), COUNT.pack(len(live)), live.tobytes()]
+    parts.extend(getattr(pool, name)[live].tobytes() for name in PARTICLE_FIELDS)
+    return b"".join(parts)
+
+def unpack_particles(pool, data, offset):
+    (pool.head,) = COUNT.unpack_from(data, offset)
+    (count,) = COUNT.unpack_from(data, offset + COUNT.size)
+    offset += 2 * COUNT.size
+    live = np.frombuffer(data, np.uint32, count, offset)
+    offset += live.nbytes
+    pool.clear()
+    for name in PARTICLE_FIELDS:
+        array = getattr(pool, name)
+        values = np.frombuffer(data, array.dtype, count * (array.size // len(array)), offset)
+        array[live] = values.reshape((count,) + array.shape[1:])
+        offset += values.nbytes
+    return offset
+
+def capture(world):
+    """The whole simulation state of `world` as bytes"""
+    config = json.dumps(settings(world), sort_keys=True).encode("utf-8")
+    parts = [HEADER.pack(MAGIC, VERSION, len(config)), config, pack_state(world), pack_rngs(world)]
+    parts.extend(pack_store(getattr(world, name)) for name in STORES)
+    parts.append(pack_particles(world.particles))
+    return b"".join(parts)
+
+def read_settings(data):
+    """The settings a snapshot was taken with (and where its state starts)"""
+    magic, version, length = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a Cosmic Flight snapshot (version " + str(VERSION) + ")")
+    config = json.loads(bytes(data[HEADER.size:HEADER.size + length]).decode("utf-8"))
+    config["level_config"] = {int(level): values for level, values in config["level_config"].items()}
+    return config, HEADER.size + length
+
+def restore(world, data):
+    """Put `world` (built with the snapshot's settings) into the captured state"""
+    _, offset = read_settings(data)
+    offset = unpack_state(world, data, offset)
+    offset = unpack_rngs(world, data, offset)
+    for name in STORES:
+        offset = unpack_store(getattr(world, name), data, offset)
+    unpack_particles(world.particles, data, offset)
+    world.alpha = 0.0
+
+def new_world(data):
+    """A new World in the snapshot's state"""
+    config, _ = read_settings(data)
+    world = World(**config)
+    restore(world, data)
+    return world
+
+def save(world, path):
+    with open(path, "wb") as f:
+        f.write(zlib.compress(capture(world)))
+
+def load(path):
+    """A new World from a file written by save()"""
+    with open(path, "rb") as f:
+        return new_world(zlib.decompress(f.read()))
+
+# =========================
+# REWIND BUFFER
+# =========================
+
+REWIND_BUDGET = 64 * 1024 * 1024  # Bytes of compressed keyframes + deltas kept
+KEYFRAME_INTERVAL = 300  # Ticks between full snapshots
+
+def xor_bytes(data, reference):
+    """`data` XOR `reference` (zero-padded or truncated to len(data))"""
+    current = np.frombuffer(data, np.uint8)
+    previous = np.zeros(len(current), np.uint8)
+    size = min(len(current), len(reference))
+    previous[:size] = np.frombuffer(reference, np.uint8, size)
+    return np.bitwise_xor(current, previous, out=previous).tobytes()
+
+class Segment:
+    """One compressed keyframe and the per-tick deltas that follow it"""
+    def __init__(self, tick, keyframe):
+        self.tick = tick
+        self.keyframe = zlib.compress(keyframe, 1)
+        self.deltas = []  # zlib(snapshot XOR previous snapshot), one per tick after `tick`
+        self.size = len(self.keyframe)
+
+class RewindBuffer:
+    """Every tick's snapshot within a memory budget: a keyframe every
+    `keyframe_interval` ticks plus compressed XOR deltas between consecutive
+    snapshots. The oldest segments are dropped once over `budget` bytes.
+    Works as a World.observer (snapshots after every tick) or via record()."""
+    def __init__(self, budget=REWIND_BUDGET, keyframe_interval=KEYFRAME_INTERVAL):
+        self.budget = budget
+        self.keyframe_interval = keyframe_interval
+        self.segments = deque()
+        self.size = 0
+        self.last = None  # Latest snapshot (uncompressed), the next delta's reference
+        self.last_tick = None
+
+    def on_action(self, world, action):
+        pass
+
+    def on_tick(self, world):
+        self.record(world)
+
+    def record(self, world):
+        """Keep the world's current state as its tick (replacing any
+        snapshots at or after that tick, e.g. after seeking back)"""
+        tick = world.game_state["tick"]
+        data = capture(world)
+        if self.last_tick is not None and tick <= self.last_tick:
+            self.truncate(tick - 1)
+        if not self.segments or self.last_tick != tick - 1 or len(self.segments[-1].deltas) + 1 >= self.keyframe_interval:
+            segment = Segment(tick, data)
+            self.segments.append(segment)
+            self.size += segment.size
+        else:
+            delta = zlib.compress(xor_bytes(data, self.last), 1)
+            self.segments[-1].deltas.append(delta)
+            self.segments[-1].size += len(delta)
+            self.size += len(delta)
+        self.last = data
+        self.last_tick = tick
+        while self.size > self.budget and len(self.segments) > 1:
+            self.size -= self.segments.popleft().size
+
+    def truncate(self, tick):
+        """Forget every snapshot after `tick`"""
+        while self.segments and self.segments[-1].tick > tick:
+            self.size -= self.segments.pop().size
+        if not self.segments:
+            self.last = self.last_tick = None
+            return
+        segment = self.segments[-1]
+        keep = tick - segment.tick
+        for delta in segment.deltas[keep:]:
+            segment.size -= len(delta)
+            self.size -= len(delta)
+        del segment.deltas[keep:]
+        self.last = self.snapshot(tick)
+        self.last_tick = tick
+
+    @property
+    def ticks(self):
+        """(first, last) buffered tick, or None when empty"""
+        if not self.segments:
+            return None
+        return self.segments[0].tick, self.last_tick
+
+    def snapshot(self, tick):
+        """Snapshot bytes of a buffered tick"""
+        for segment in reversed(self.segments):
+            if segment.tick <= tick:
+                break
+        else:
+            raise KeyError("tick " + str(tick) + " is not in the rewind buffer")
+        if tick - segment.tick > len(segment.deltas):
+            raise KeyError("tick " + str(tick) + " is not in the rewind buffer")
+        data = zlib.decompress(segment.keyframe)
+        for delta in segment.deltas[:tick - segment.tick]:
+            data = xor_bytes(zlib.decompress(delta), data)
+        return data
+
+    def seek(self, world, tick):
+        """Rewind (or fast-forward) `world` to a buffered tick"""
+        restore(world, self.snapshot(tick))
+
+    def branch(self, tick):
+        """A new, independent World at a buffered tick"""
+        return new_world(self.snapshot(tick))